@@ -0,0 +1,240 @@
+import numpy as np
+
+
+MAX_POINTS = 2000   # points drawn per line, whatever the number of customers
+MAX_LABELS = 40     # value labels drawn per chart
+
+
+# Matplotlib is only imported once a chart is requested, which keeps the simulators quick to import
+def figure_canvas(fig, master):
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return FigureCanvasTkAgg(fig, master)
+
+
+def min_max_downsample(values, lo, hi, buckets):
+    # Indices of the minimum and maximum of every bucket in values[lo:hi], in order
+    # Peaks and dips survive, so the line looks the same as the full series at screen resolution
+    count = hi - lo
+    if count <= 2 * buckets:
+        return np.arange(lo, hi)
+    size = -(-count // buckets)
+    buckets = -(-count // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:count] = values[lo:hi]
+    rows = padded.reshape(buckets, size)
+    starts = lo + np.arange(buckets) * size
+    first = starts + np.nanargmin(rows, axis=1)
+    second = starts + np.nanargmax(rows, axis=1)
+    return np.unique(np.concatenate((first, second)))
+
+
+def label_positions(indices, max_labels):
+    # Evenly spread a limited number of labels over the drawn points
+    if len(indices) <= max_labels:
+        return indices
+    return indices[np.linspace(0, len(indices) - 1, max_labels).round().astype(int)]
+
+
+def time_series_chart(values, title, ylabel, color, linestyle='-', xlabel="Customer Index",
+                      max_points=MAX_POINTS, max_labels=MAX_LABELS, customers=None):
+    # Line chart of one value per customer drawn from a downsampled series
+    # Zooming or panning re-downsamples the visible range, so detail comes back as you zoom in
+    # customers gives the increasing customer number of every value (a sample of a streamed run);
+    # by default value i belongs to customer i + 1
+    import matplotlib.pyplot as plt
+
+    values = np.asarray(values, dtype=float)
+    x = np.arange(1, len(values) + 1) if customers is None else np.asarray(customers, dtype=float)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    line, = ax.plot([], [], marker='o', linestyle=linestyle, color=color)
+    labels = []
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+
+    def redraw(lo, hi):
+        indices = min_max_downsample(values, lo, hi, max_points // 2)
+        line.set_data(x[indices], values[indices])
+        # Markers only while every customer in view is drawn
+        line.set_marker('o' if len(indices) == hi - lo and len(indices) <= max_points // 4 else '')
+
+        # Add values over a limited number of points
+        for label in labels:
+            label.remove()
+        labels.clear()
+        for i in label_positions(indices, max_labels):
+            labels.append(ax.text(x[i], values[i] + 0.1, f"{values[i]:.2f}", ha="center", va="bottom",
+                                  color='black', fontsize=8))
+
+    def on_xlim_changed(ax):
+        x_min, x_max = ax.get_xlim()
+        lo = max(0, int(np.searchsorted(x, x_min)) - 1)
+        hi = min(len(values), int(np.searchsorted(x, x_max, side="right")) + 1)
+        if hi > lo:
+            redraw(lo, hi)
+
+    redraw(0, len(values))
+    if len(values):
+        ax.set_xlim(1 - 0.02 * x[-1], x[-1] * 1.02)
+        ax.set_ylim(*padded_limits(values))
+    ax.callbacks.connect("xlim_changed", on_xlim_changed)
+    return fig
+
+
+def padded_limits(values):
+    low, high = np.nanmin(values), np.nanmax(values)
+    pad = (high - low) * 0.08 or 1
+    return low - pad, high + pad
+
+
+# --- Parameter sweeps ---
+def sweep_chart(values, x_values, y_values, title, xlabel, ylabel, kind="Heatmap"):
+    # Heatmap or filled contours of one metric over a two-parameter grid of shape (len(y), len(x))
+    # Unstable points are NaN and show through as the gray background
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm, Normalize
+    from matplotlib.ticker import LogLocator
+
+    grid = np.ma.masked_invalid(values)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.set_facecolor("lightgray")
+    ax.set_title(f"{title} (gray: unstable)")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if grid.count() == 0:
+        return fig
+
+    # Waiting times explode near rho = 1, so a wide range is colored on a log scale
+    # Values more than 6 decades below the maximum all get the darkest color
+    low, high = grid.min(), grid.max()
+    ticks = None
+    if low > 0 and high / low > 100:
+        low = max(low, high * 1e-6)
+        norm = LogNorm(low, high)
+        levels = np.geomspace(low, high, 20)
+        ticks = LogLocator()
+    else:
+        norm = Normalize(low, high)
+        levels = np.linspace(low, high, 20) if high > low else None
+
+    if kind == "Contour" and levels is not None and min(grid.shape) > 1:
+        mesh = ax.contourf(x_values, y_values, grid, levels=levels, norm=norm, cmap="viridis", extend="min")
+        lines = ax.contour(x_values, y_values, grid, levels=levels[::4], norm=norm, colors="black", linewidths=0.5)
+        ax.clabel(lines, fontsize=8, fmt="%.3g")
+    else:
+        mesh = ax.pcolormesh(x_values, y_values, grid, norm=norm, cmap="viridis", shading="nearest")
+    fig.colorbar(mesh, ax=ax, label=title, ticks=ticks)
+    return fig
+
+
+# --- Transient analysis ---
+def transient_chart(result, steady, title):
+    # Queue lengths and probabilities over time, with the steady state of the same model as dashed lines
+    # steady is the calculator result, or None when the queue has no steady state (rho >= 1)
+    import matplotlib.pyplot as plt
+
+    times = result["Times"]
+    fig, (top, bottom) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
+    for ax, keys in [(top, ["L", "Lq"]), (bottom, ["P(wait)", "Utilization (rho)", "Blocking Probability"])]:
+        for i, key in enumerate(keys):
+            if key not in result:
+                continue
+            ax.plot(times, result[key], color=f"C{i}", label=key)
+            if steady is not None and key in steady:
+                ax.axhline(steady[key], color=f"C{i}", linestyle="--", linewidth=1)
+        ax.grid(True)
+        ax.legend(loc="best")
+    top.set_title(f"{title} (dashed: steady state)")
+    top.set_ylabel("Customers")
+    bottom.set_ylabel("Probability")
+    bottom.set_xlabel("Time")
+    fig.tight_layout()
+    return fig
+
+
+# --- Gantt charts ---
+MIN_LABEL_WIDTH = 40    # pixels a bar needs before its service time is written on it
+MAX_GANTT_LABELS = 200
+
+
+def server_jobs(result, servers):
+    # Per-server index built once after the simulation: the customers of every server in start order
+    order = np.argsort(result["server"], kind="stable")
+    counts = np.bincount(result["server"], minlength=servers)
+    return np.split(order, np.cumsum(counts)[:-1])
+
+
+def lane_intervals(start_times, finish_times, x_min, x_max, pixels_per_unit):
+    # Busy and idle (start, width) intervals of one server inside the visible time range
+    lo = np.searchsorted(finish_times, x_min, side="right")
+    hi = np.searchsorted(start_times, x_max, side="left")
+    starts = start_times[lo:hi]
+    finishes = finish_times[lo:hi]
+    prev_end = finish_times[lo - 1] if lo > 0 else 0.0
+
+    # When jobs are narrower than a pixel on average, merge the ones separated by less than a pixel
+    if len(starts) > (x_max - x_min) * pixels_per_unit:
+        breaks = np.flatnonzero((starts[1:] - finishes[:-1]) * pixels_per_unit >= 1) + 1
+        starts = starts[np.concatenate(([0], breaks))]
+        finishes = finishes[np.concatenate((breaks - 1, [len(finishes) - 1]))]
+
+    # Idle time gaps before each busy interval starts
+    prev_ends = np.concatenate(([prev_end], finishes[:-1]))
+    idle = starts > prev_ends
+    busy = np.column_stack((starts, finishes - starts))
+    gaps = np.column_stack((prev_ends[idle], (starts - prev_ends)[idle]))
+    return busy, gaps
+
+
+def gantt_chart(result, jobs_by_server, server_ids, title):
+    # One lane per server; its jobs and its idle gaps are each drawn as a single broken_barh collection
+    # Only what is visible at the current zoom is drawn, so the chart stays fast for 100k jobs
+    import matplotlib.pyplot as plt
+
+    lanes = []
+    for server_idx in server_ids:
+        jobs = jobs_by_server[server_idx]
+        lanes.append((result["start_times"][jobs], result["service_times"][jobs], result["finish_times"][jobs]))
+
+    fig, ax = plt.subplots(figsize=(10, min(12, max(4, 0.4 * len(server_ids) + 2))))
+    # Thin out the lane labels so they stay readable for 100+ servers
+    step = max(1, len(server_ids) // 40)
+    ax.set_yticks(range(0, len(server_ids), step))
+    ax.set_yticklabels([f"Server {server_idx + 1}" for server_idx in list(server_ids)[::step]])
+    ax.set_ylim(len(server_ids) - 0.5, -0.5)
+    end_time = max([lane[2][-1] for lane in lanes if len(lane[2])], default=1)
+    ax.set_xlim(0, end_time * 1.02)
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Servers')
+    ax.set_title(title)
+    plt.tight_layout()
+
+    artists = []
+
+    def on_xlim_changed(ax):
+        for artist in artists:
+            artist.remove()
+        artists.clear()
+
+        x_min, x_max = ax.get_xlim()
+        pixels_per_unit = ax.bbox.width / max(x_max - x_min, 1e-9)
+        labels = 0
+        for lane, (start_times, service_times, finish_times) in enumerate(lanes):
+            busy, gaps = lane_intervals(start_times, finish_times, x_min, x_max, pixels_per_unit)
+            artists.append(ax.broken_barh(gaps, (lane - 0.4, 0.8), facecolors='white', edgecolors='black', hatch='//'))
+            artists.append(ax.broken_barh(busy, (lane - 0.4, 0.8), facecolors=f"C{server_ids[lane] % 10}",
+                                          edgecolors='black', linewidth=0.5))
+
+            # Only write service times on bars that are wide enough to hold them
+            lo = np.searchsorted(finish_times, x_min, side="right")
+            hi = np.searchsorted(start_times, x_max, side="left")
+            wide = lo + np.flatnonzero(service_times[lo:hi] * pixels_per_unit >= MIN_LABEL_WIDTH)
+            for job in wide[:MAX_GANTT_LABELS - labels]:
+                artists.append(ax.text(start_times[job] + service_times[job] / 2, lane, f"{service_times[job]:.2f}",
+                                       ha='center', va='center', color='black', fontsize=8))
+            labels += min(len(wide), MAX_GANTT_LABELS - labels)
+
+    ax.callbacks.connect("xlim_changed", on_xlim_changed)
+    on_xlim_changed(ax)
+    return fig
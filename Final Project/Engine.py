@@ -0,0 +1,459 @@
+import heapq
+import math
+import numpy as np
+
+
+# --- Sampling ---
+def poisson_cdf_table(lmbda, tail=12):
+    # Truncated Poisson CDF covering lmbda +/- tail standard deviations
+    # The pmf is built with the recurrence p(k) = p(k - 1) * lmbda / k in log space so it never overflows
+    spread = tail * math.sqrt(lmbda) + tail
+    k_lo = max(0, int(lmbda - spread))
+    k_hi = int(lmbda + spread) + 1
+    ks = np.arange(k_lo, k_hi + 1)
+    log_pmf = np.empty(len(ks))
+    log_pmf[0] = -lmbda + k_lo * math.log(lmbda) - math.lgamma(k_lo + 1)
+    log_pmf[1:] = log_pmf[0] + np.cumsum(math.log(lmbda) - np.log(ks[1:]))
+    cdf = np.cumsum(np.exp(log_pmf))
+    return ks, cdf / cdf[-1]
+
+
+def poisson_inter_arrival_times(lmbda, arrivals, rng=None):
+    # One inter-arrival time for every arrival after the first
+    rng = np.random.default_rng() if rng is None else rng
+    size = max(arrivals - 1, 0)
+    if lmbda <= 0:
+        return np.zeros(size)
+
+    # Map all random numbers onto the cumulative distribution with a binary search
+    ks, cdf = poisson_cdf_table(lmbda)
+    rn = rng.random(size)
+    idx = np.minimum(np.searchsorted(cdf, rn, side="left"), len(ks) - 1)
+    return ks[idx].astype(float)
+
+
+def exponential_service_times(mu, size, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    return np.ceil(rng.exponential(1 / mu, size) * 10)
+
+
+# General distributions of MGC and GGC, with params
+# Normal (mean, standard deviation), Uniform (a, b), Gamma (shape, scale),
+# Lognormal (mean, standard deviation of the log) and Weibull (shape, scale)
+DISTRIBUTIONS = ["Normal", "Uniform", "Gamma", "Lognormal", "Weibull"]
+
+
+def distribution_times(distribution, params, size, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    size = max(size, 0)
+    if distribution in DISTRIBUTIONS and len(params) != 2:
+        raise ValueError(f"The {distribution} distribution takes two parameters, got {len(params)}.")
+    if distribution == "Normal":
+        mu, sigma = params
+        times = rng.normal(mu, sigma, size)
+    elif distribution == "Uniform":
+        a, b = params
+        times = rng.uniform(a, b, size)
+    elif distribution == "Gamma":
+        shape, scale = params
+        times = rng.gamma(shape, scale, size)
+    elif distribution == "Lognormal":
+        mean, sigma = params
+        times = rng.lognormal(mean, sigma, size)
+    elif distribution == "Weibull":
+        shape, scale = params
+        times = scale * rng.weibull(shape, size)
+    else:
+        raise ValueError(f"Unsupported distribution: {distribution}")
+    # Ensure non-negative times
+    return np.ceil(np.maximum(0, times))
+
+
+def arrival_times_from(inter_arrival_times):
+    # First arrival at time 0
+    return np.concatenate(([0.0], np.cumsum(inter_arrival_times)))
+
+
+# --- Simulation ---
+ENGINES = ["direct", "simpy"]
+
+
+class ServerPool:
+    # Server bookkeeping in O(log c) per customer
+    # Idle servers sit in a heap of indices so Server 1 is still preferred over Server 2, etc.
+    # Busy servers sit in a heap of (next free time, index) so the one that gets free the earliest is on top
+    # Customers must be served in order of arrival
+    def __init__(self, servers):
+        self.idle = list(range(servers))
+        self.busy = []
+        self.busy_time = [0] * servers
+
+    def serve(self, now, service_time):
+        # Release every server that is free by the arrival time
+        busy = self.busy
+        while busy and busy[0][0] <= now:
+            heapq.heappush(self.idle, heapq.heappop(busy)[1])
+
+        # Assign the first available server, otherwise the one that gets free the earliest
+        if self.idle:
+            server_idx = heapq.heappop(self.idle)
+            start_time = now
+        else:
+            start_time, server_idx = heapq.heappop(busy)
+
+        finish_time = start_time + service_time
+        heapq.heappush(busy, (finish_time, server_idx))
+        self.busy_time[server_idx] += service_time
+        return server_idx, start_time, finish_time
+
+
+def run_fcfs(arrival_times, service_times, servers, engine="direct"):
+    # Run a first-come-first-served multi-server queue for pre-sampled arrival and service times
+    # Both engines produce the same schedule for the same inputs
+    if engine == "direct":
+        schedule = fcfs_direct(arrival_times, service_times, servers)
+    elif engine == "simpy":
+        schedule = fcfs_simpy(arrival_times, service_times, servers)
+    else:
+        raise ValueError(f"Unsupported engine: {engine}")
+    return fcfs_result(arrival_times, service_times, *schedule)
+
+
+def fcfs_direct(arrival_times, service_times, servers):
+    # Kiefer-Wolfowitz recursion: every customer starts at max(arrival, free time of its server)
+    # Arrivals are already sorted, so no event queue is needed
+    pool = ServerPool(servers)
+    return serve_all(pool, arrival_times, service_times) + (pool.busy_time,)
+
+
+def serve_all(pool, arrival_times, service_times):
+    arrivals = len(arrival_times)
+    start_times = [0.0] * arrivals
+    finish_times = [0.0] * arrivals
+    server_of = [0] * arrivals
+    serve = pool.serve
+
+    for i, (arrival_time, service_time) in enumerate(zip(np.asarray(arrival_times).tolist(), np.asarray(service_times).tolist())):
+        server_idx, start_time, finish_time = serve(arrival_time, service_time)
+        start_times[i] = start_time
+        finish_times[i] = finish_time
+        server_of[i] = server_idx
+
+    return start_times, finish_times, server_of
+
+
+def fcfs_simpy(arrival_times, service_times, servers):
+    import simpy
+
+    env = simpy.Environment()
+    arrivals = len(arrival_times)
+    start_times = [0.0] * arrivals
+    finish_times = [0.0] * arrivals
+    server_of = [0] * arrivals
+    pool = ServerPool(servers)
+
+    def customer(env, i, arrival_time, service_time):
+        yield env.timeout(arrival_time - env.now)
+
+        server_idx, start_time, finish_time = pool.serve(env.now, service_time)
+        start_times[i] = start_time
+        finish_times[i] = finish_time
+        server_of[i] = server_idx
+
+        yield env.timeout(service_time)
+
+    for i in range(arrivals):
+        env.process(customer(env, i, arrival_times[i], service_times[i]))
+
+    env.run()
+
+    return start_times, finish_times, server_of, pool.busy_time
+
+
+def fcfs_result(arrival_times, service_times, start_times, finish_times, server_of, server_busy_time):
+    # Results are stored column by column in typed arrays; customer i is row i and servers are 0-based
+    # Response time equals waiting time, so both keys share one array
+    arrival_times = np.asarray(arrival_times, dtype=float)
+    service_times = np.asarray(service_times, dtype=float)
+    start_times = np.array(start_times, dtype=float)
+    finish_times = np.array(finish_times, dtype=float)
+    waiting_times = start_times - arrival_times
+    return {
+        "arrival_times": arrival_times,
+        "service_times": service_times,
+        "start_times": start_times,
+        "finish_times": finish_times,
+        "turnaround_times": finish_times - arrival_times,
+        "waiting_times": waiting_times,
+        "response_times": waiting_times,
+        "server": np.array(server_of, dtype=np.int32),
+        "server_busy_time": np.array(server_busy_time, dtype=float),
+    }
+
+
+# --- Display ---
+TABLE_COLUMNS = ("Customer", "Server", "Arrival Time", "Service Time", "Start Time", "End Time",
+                 "Turnaround Time", "Wait Time", "Response Time")
+TABLE_KEYS = ["arrival_times", "service_times", "start_times", "finish_times",
+              "turnaround_times", "waiting_times", "response_times"]
+SUMMARY_KEYS = ["service_times", "turnaround_times", "waiting_times", "response_times"]
+
+
+def table_row(result, i):
+    # Labels are only formatted for the rows that are displayed
+    return [f"Customer {i + 1}", f"Server {result['server'][i] + 1}"] + [f"{result[key][i]:.2f}" for key in TABLE_KEYS]
+
+
+def summary_rows(result):
+    # Summation and average rows for the service, turnaround, waiting and response columns
+    sums = {key: result[key].sum() for key in SUMMARY_KEYS}
+    arrivals = len(result["arrival_times"])
+    rows = []
+    for label, scale in [("Total", 1), ("Average", arrivals)]:
+        values = {key: f"{sums[key] / scale:.2f}" for key in SUMMARY_KEYS}
+        rows.append([label, "-", "-", values["service_times"], "-", "-",
+                     values["turnaround_times"], values["waiting_times"], values["response_times"]])
+    return rows
+
+
+# --- Models ---
+# Pass an np.random.Generator, or any source from Random_Source, as rng for reproducible runs
+def run_mmc(lmbda, mu, servers, arrivals, engine="direct", rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    inter_arrival_times = poisson_inter_arrival_times(lmbda, arrivals, rng)
+    arrival_times = arrival_times_from(inter_arrival_times)
+    service_times = exponential_service_times(mu, len(arrival_times), rng)
+    result = run_fcfs(arrival_times, service_times, servers, engine)
+    result["inter_arrival_times"] = inter_arrival_times
+    return result
+
+
+def run_mgc(lmbda, servers, arrivals, service_distribution, dist_params, engine="direct", rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    inter_arrival_times = poisson_inter_arrival_times(lmbda, arrivals, rng)
+    arrival_times = arrival_times_from(inter_arrival_times)
+    service_times = distribution_times(service_distribution, dist_params, len(arrival_times), rng)
+    result = run_fcfs(arrival_times, service_times, servers, engine)
+    result["inter_arrival_times"] = inter_arrival_times
+    return result
+
+
+def run_ggc(arrival_distribution, arrival_params, servers, arrivals, service_distribution, service_params,
+            engine="direct", rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    inter_arrival_times = distribution_times(arrival_distribution, arrival_params, arrivals - 1, rng)
+    arrival_times = arrival_times_from(inter_arrival_times)
+    service_times = distribution_times(service_distribution, service_params, len(arrival_times), rng)
+    result = run_fcfs(arrival_times, service_times, servers, engine)
+    result["inter_arrival_times"] = inter_arrival_times
+    return result
+
+
+# --- Streaming ---
+# The stream_* functions yield the run in chunks of at most chunk_size customers so that
+# arbitrarily long runs need bounded memory. Every chunk has the same keys as a run_* result
+# plus "first_customer" (index of its first customer) and the server busy time so far.
+# The simulator windows stream runs longer than STREAM_CUSTOMERS through stream_view below.
+def stream_fcfs(draw_inter_arrival_times, draw_service_times, servers, arrivals, chunk_size=65536):
+    pool = ServerPool(servers)
+    last_arrival = 0.0
+    first = 0
+    while first < arrivals:
+        size = min(chunk_size, arrivals - first)
+        if first == 0:
+            # First arrival at time 0
+            inter_arrival_times = draw_inter_arrival_times(size - 1)
+            arrival_times = arrival_times_from(inter_arrival_times)
+        else:
+            inter_arrival_times = draw_inter_arrival_times(size)
+            arrival_times = last_arrival + np.cumsum(inter_arrival_times)
+        service_times = draw_service_times(size)
+
+        schedule = serve_all(pool, arrival_times, service_times)
+        chunk = fcfs_result(arrival_times, service_times, *schedule, pool.busy_time)
+        chunk["inter_arrival_times"] = inter_arrival_times
+        chunk["first_customer"] = first
+        yield chunk
+
+        last_arrival = arrival_times[-1]
+        first += size
+
+
+def stream_mmc(lmbda, mu, servers, arrivals, chunk_size=65536, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    return stream_fcfs(lambda size: poisson_inter_arrival_times(lmbda, size + 1, rng),
+                       lambda size: exponential_service_times(mu, size, rng),
+                       servers, arrivals, chunk_size)
+
+
+def stream_mgc(lmbda, servers, arrivals, service_distribution, dist_params, chunk_size=65536, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    return stream_fcfs(lambda size: poisson_inter_arrival_times(lmbda, size + 1, rng),
+                       lambda size: distribution_times(service_distribution, dist_params, size, rng),
+                       servers, arrivals, chunk_size)
+
+
+def stream_ggc(arrival_distribution, arrival_params, servers, arrivals, service_distribution, service_params,
+               chunk_size=65536, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    return stream_fcfs(lambda size: distribution_times(arrival_distribution, arrival_params, size, rng),
+                       lambda size: distribution_times(service_distribution, service_params, size, rng),
+                       servers, arrivals, chunk_size)
+
+
+class RunningStats:
+    # Mean, variance, min and max of a stream without keeping its history
+    # Each chunk is merged with the Welford / Chan update so chunks can have any size
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean()
+        m2 = ((values - mean)**2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+STREAM_COLUMNS = {
+    "Service Time": "service_times",
+    "Turnaround Time": "turnaround_times",
+    "Waiting Time": "waiting_times",
+    "Response Time": "response_times",
+}
+RECORD_KEYS = ["arrival_times", "service_times", "start_times", "finish_times",
+               "turnaround_times", "waiting_times", "response_times", "server"]
+
+
+def summarize_stream(chunks, head=0, sample=0, rng=None):
+    # Consume a stream keeping running statistics, the first `head` records
+    # and a uniform random sample of `sample` records (reservoir sampling)
+    rng = np.random.default_rng() if rng is None else rng
+    stats = {name: RunningStats() for name in STREAM_COLUMNS}
+    head_chunks = []
+    kept = 0
+    reservoir = None
+    seen = 0
+    total_time = 0.0
+    server_busy_time = None
+
+    for chunk in chunks:
+        for name, key in STREAM_COLUMNS.items():
+            stats[name].update(chunk[key])
+        total_time = max(total_time, chunk["finish_times"].max())
+        server_busy_time = chunk["server_busy_time"]
+
+        if kept < head:
+            take = min(head - kept, len(chunk["arrival_times"]))
+            records = {key: chunk[key][:take] for key in RECORD_KEYS}
+            # The first customer has no inter-arrival time
+            records["inter_arrival_times"] = chunk["inter_arrival_times"][:take - 1 if kept == 0 else take]
+            head_chunks.append(records)
+            kept += take
+
+        if sample:
+            size = len(chunk["arrival_times"])
+            customers = np.arange(seen, seen + size) + 1
+            if reservoir is None:
+                reservoir = {key: np.empty(0, dtype=chunk[key].dtype) for key in RECORD_KEYS}
+                reservoir["customer"] = np.empty(0, dtype=np.int64)
+            # Fill the reservoir first, then record i replaces a random slot with probability sample / i
+            fill = max(0, min(sample - seen, size))
+            for key in RECORD_KEYS:
+                reservoir[key] = np.concatenate((reservoir[key], chunk[key][:fill]))
+            reservoir["customer"] = np.concatenate((reservoir["customer"], customers[:fill]))
+            slots = rng.integers(0, customers[fill:])
+            for i in np.flatnonzero(slots < sample):
+                for key in RECORD_KEYS:
+                    reservoir[key][slots[i]] = chunk[key][fill + i]
+                reservoir["customer"][slots[i]] = customers[fill + i]
+            seen += size
+
+    summary = {
+        "stats": stats,
+        "total_time": total_time,
+        "server_busy_time": server_busy_time,
+        "utilizations": None if server_busy_time is None else server_busy_time / total_time * 100,
+    }
+    if head:
+        summary["head"] = {key: np.concatenate([c[key] for c in head_chunks]) for key in head_chunks[0]} if head_chunks else None
+    if sample:
+        if reservoir is not None:
+            order = np.argsort(reservoir["customer"], kind="stable")
+            reservoir = {key: values[order] for key, values in reservoir.items()}
+        summary["sample"] = reservoir
+    return summary
+
+
+# --- Simulator windows ---
+# Runs of more than STREAM_CUSTOMERS customers are streamed so the windows need bounded memory: the table
+# pages over the first HEAD_RECORDS customers, the time-series charts plot a uniform sample of SAMPLE_RECORDS
+# customers and the Total and Average rows come from the running statistics of every customer.
+STREAM_CUSTOMERS = 10**6
+HEAD_RECORDS = 10**5
+SAMPLE_RECORDS = 20000
+
+
+def result_view(result):
+    # What a simulator window shows of a whole run: every customer in the table and the charts
+    # "customers" holds the 1-based customer number of every entry of "series"
+    return {
+        "table": result,
+        "summary": summary_rows(result),
+        "series": result,
+        "customers": np.arange(1, len(result["arrival_times"]) + 1),
+        "inter_arrival_times": result["inter_arrival_times"],
+        "total_time": result["finish_times"].max(),
+        "server_busy_time": result["server_busy_time"],
+        "arrivals": len(result["arrival_times"]),
+    }
+
+
+def stream_summary_rows(stats):
+    # summary_rows from the running statistics of summarize_stream
+    rows = []
+    for label in ["Total", "Average"]:
+        values = {name: f"{s.mean * s.count if label == 'Total' else s.mean:.2f}" for name, s in stats.items()}
+        rows.append([label, "-", "-", values["Service Time"], "-", "-",
+                     values["Turnaround Time"], values["Waiting Time"], values["Response Time"]])
+    return rows
+
+
+def stream_view(chunks, head=None, sample=None):
+    # result_view of a streamed run: the first `head` customers in the table and the Gantt charts, a
+    # reservoir sample of `sample` customers in the time-series charts and the first `head` inter-arrival times
+    # The sample only picks which records to plot, so a fixed seed keeps seeded runs identical
+    head = HEAD_RECORDS if head is None else head
+    sample = SAMPLE_RECORDS if sample is None else sample
+    summary = summarize_stream(chunks, head=head, sample=sample, rng=np.random.default_rng(0))
+    table = summary["head"]
+    return {
+        "table": table,
+        "summary": stream_summary_rows(summary["stats"]),
+        "series": summary["sample"],
+        "customers": summary["sample"]["customer"],
+        "inter_arrival_times": table["inter_arrival_times"],
+        "total_time": summary["total_time"],
+        "server_busy_time": summary["server_busy_time"],
+        "arrivals": summary["stats"]["Service Time"].count,
+    }
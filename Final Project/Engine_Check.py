@@ -0,0 +1,67 @@
+import sys
+import numpy as np
+import Engine
+
+
+# Equivalence check of the direct (Kiefer-Wolfowitz) engine against the SimPy engine
+# Run "python Engine_Check.py [customers per case]"; every case samples its inputs once with a fixed seed,
+# runs both engines on them and requires identical start, finish and server arrays.
+# Both engines share ServerPool, so the schedules are also checked against the server choice of the
+# original simulators: a scan for the first free server in order, or else the one that is free the earliest.
+CUSTOMERS = 20000
+SEEDS = [1, 2, 3]
+SERVERS = [1, 2, 5, 20]
+# Model name and Engine.run_* with its arguments; every case loads the servers to about 90%
+CASES = [
+    ("MMC", lambda servers, customers: (Engine.run_mmc, (2, 10 / (1.8 * servers), servers, customers))),
+    ("MGC", lambda servers, customers: (Engine.run_mgc, (2, servers, customers, "Uniform", (0, 3.6 * servers)))),
+    ("GGC", lambda servers, customers: (Engine.run_ggc, ("Gamma", (2, 5), servers, customers, "Normal",
+                                                         (9 * servers, 3 * servers)))),
+]
+COMPARED = ["start_times", "finish_times", "server", "server_busy_time"]
+
+
+def reference_schedule(arrival_times, service_times, servers):
+    # The server choice of the original simulators, one linear scan per customer
+    next_free = [0.0] * servers
+    start_times, finish_times, server_of = [], [], []
+    for arrival_time, service_time in zip(arrival_times.tolist(), service_times.tolist()):
+        free = [idx for idx in range(servers) if next_free[idx] <= arrival_time]
+        server_idx = free[0] if free else min(range(servers), key=lambda idx: next_free[idx])
+        start_time = max(arrival_time, next_free[server_idx])
+        next_free[server_idx] = start_time + service_time
+        start_times.append(start_time)
+        finish_times.append(start_time + service_time)
+        server_of.append(server_idx)
+    return np.array(start_times), np.array(finish_times), np.array(server_of)
+
+
+def check_case(run, args, seed):
+    # Names of the arrays that differ; the same seed gives both engines the same sampled inputs
+    direct = run(*args, engine="direct", rng=np.random.default_rng(seed))
+    simpy = run(*args, engine="simpy", rng=np.random.default_rng(seed))
+    mismatches = [key for key in COMPARED + ["arrival_times", "service_times"]
+                  if not np.array_equal(direct[key], simpy[key])]
+    reference = reference_schedule(direct["arrival_times"], direct["service_times"], len(direct["server_busy_time"]))
+    for key, values in zip(["start_times", "finish_times", "server"], reference):
+        if not np.array_equal(direct[key], values):
+            mismatches.append(f"{key} (original server choice)")
+    return mismatches
+
+
+def main():
+    customers = int(sys.argv[1]) if len(sys.argv) > 1 else CUSTOMERS
+    failures = 0
+    print(f"{'Model':<6}{'c':>4}{'Seed':>6}  Result")
+    for model, case in CASES:
+        for servers in SERVERS:
+            for seed in SEEDS:
+                run, args = case(servers, customers)
+                mismatches = check_case(run, args, seed)
+                failures += bool(mismatches)
+                print(f"{model:<6}{servers:>4}{seed:>6}  {'differs: ' + ', '.join(mismatches) if mismatches else 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
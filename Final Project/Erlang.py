@@ -0,0 +1,55 @@
+# Erlang B and Erlang C in plain floats, stable for any number of servers
+# a = lambda / mu is the offered load in Erlangs, c the number of servers
+
+
+def erlang_b(a, c):
+    # Blocking probability of M/M/c/c: B(c) = (a^c / c!) / sum(a^k / k!, k = 0..c)
+    # 1 / B(c) = sum over j of c (c - 1) ... (c - j + 1) / a^j, summed from k = c downwards
+    # Only the terms that matter are visited: about (c - a) + 10 sqrt(a) of them instead of c big factorials
+    if c < 0 or a < 0:
+        raise ValueError("Servers and offered load must not be negative.")
+    if a == 0:
+        return 1.0 if c == 0 else 0.0
+    total = term = 1.0
+    for k in range(c, 0, -1):
+        term *= k / a
+        total += term
+        if total > 1e300:
+            # B is below the smallest float
+            return 0.0
+        if k <= a and term < total * 1e-17:
+            break
+    return 1 / total
+
+
+def erlang_b_sequence(a, start=0):
+    # B(start), B(start + 1), ... from the recurrence B(k) = a B(k - 1) / (k + a B(k - 1))
+    # Each next c costs one step, so searches over increasing c reuse all the earlier work
+    b = erlang_b(a, start)
+    k = start
+    while True:
+        yield b
+        k += 1
+        b = a * b / (k + a * b)
+
+
+def erlang_c_from_b(b, a, c):
+    # Probability of waiting in M/M/c given B(c); only defined when rho = a / c < 1
+    rho = a / c
+    return b / (1 - rho * (1 - b))
+
+
+def erlang_c(a, c):
+    # Probability that an arrival has to wait in M/M/c
+    # Equal to Po * a^c / (c! (1 - rho)) but never overflows, even for 10^5 servers
+    if c <= 0 or a >= c:
+        raise ValueError("Erlang C needs rho = a / c < 1.")
+    return erlang_c_from_b(erlang_b(a, c), a, c)
+
+
+def mmc_lq(lambda_rate, mu_rate, servers):
+    # Mean queue length of M/M/c: Lq = C(c, a) rho / (1 - rho)
+    a = lambda_rate / mu_rate
+    rho = a / servers
+    return erlang_c(a, servers) * rho / (1 - rho)
+
@@ -0,0 +1,70 @@
+import math
+import sys
+import numpy as np
+import Queue_Vector
+from Erlang import erlang_c
+from Queuing_Cal import mmc_queue
+
+
+# Cross-check of the float Erlang C recurrence against the original factorial formula of mmc_queue
+# Run "python Erlang_Check.py [relative tolerance]". The factorial formula only works while a^c and c!
+# fit in a float (c up to 170), so the grid stops there; points where it overflows anyway are skipped.
+TOLERANCE = 1e-10
+SERVERS = list(range(1, 31)) + list(range(35, 171, 5))
+UTILIZATIONS = [0.01, 0.1, 0.3, 0.5, 0.7, 0.8, 0.9, 0.95, 0.99, 0.999]
+MU = 2.0
+METRICS = ["Lq", "Wq", "W", "L"]
+
+
+def factorial_mmc(lambda_rate, mu_rate, servers):
+    # The M/M/c metrics and P(wait) as mmc_queue computed them before the recurrence
+    rho = lambda_rate / (servers * mu_rate)
+    Po = 1 / (sum([(lambda_rate / mu_rate)**k / math.factorial(k) for k in range(servers)]) +
+              ((lambda_rate / mu_rate)**servers / (math.factorial(servers) * (1 - rho))))
+    Lq = (Po * (lambda_rate / mu_rate)**servers * rho) / \
+        (math.factorial(servers) * (1 - rho)**2)
+    Wq = Lq / lambda_rate
+    W = Wq + 1 / mu_rate
+    L = lambda_rate * W
+    wait = Po * (lambda_rate / mu_rate)**servers / (math.factorial(servers) * (1 - rho))
+    return {"Lq": Lq, "Wq": Wq, "W": W, "L": L, "P(wait)": wait}
+
+
+def relative_error(value, expected):
+    return abs(value - expected) / abs(expected) if expected else abs(value)
+
+
+def main():
+    tolerance = float(sys.argv[1]) if len(sys.argv) > 1 else TOLERANCE
+    worst = {name: (0.0, None) for name in METRICS + ["P(wait)", "Vector Lq"]}
+    checked = skipped = 0
+    points = [(c, u) for c in SERVERS for u in UTILIZATIONS]
+    vector = Queue_Vector.mmc_queue([c * u * MU for c, u in points], MU, [c for c, _ in points])
+    for i, (servers, utilization) in enumerate(points):
+        lambda_rate = servers * utilization * MU
+        try:
+            expected = factorial_mmc(lambda_rate, MU, servers)
+        except OverflowError:
+            skipped += 1
+            continue
+        checked += 1
+        result = mmc_queue(lambda_rate, MU, servers)
+        errors = {name: relative_error(result[name], expected[name]) for name in METRICS}
+        errors["P(wait)"] = relative_error(erlang_c(lambda_rate / MU, servers), expected["P(wait)"])
+        errors["Vector Lq"] = relative_error(float(vector["Lq"][i]), expected["Lq"])
+        for name, error in errors.items():
+            if error > worst[name][0]:
+                worst[name] = (error, (servers, utilization))
+
+    print(f"{checked} points checked, {skipped} skipped where the factorial formula overflows")
+    print(f"{'Metric':<12}{'Worst rel. error':>18}  {'at (c, rho)':<14}Result")
+    failures = 0
+    for name, (error, point) in worst.items():
+        failed = error > tolerance
+        failures += failed
+        print(f"{name:<12}{error:>18.2e}  {str(point):<14}{'FAIL' if failed else 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+import csv
+import math
+import os
+import sys
+import zipfile
+import numpy as np
+from Stats import chi2_sf, kolmogorov_sf
+
+
+# Distribution fitting for collected arrival and service data, like the shop data in "Collected Data and
+# Chi square". The bins and degrees of freedom follow the rules below, not those of the hand-done tests
+# in that folder, so the statistics and verdicts differ from them.
+# - Loading: one column of a .csv, .xlsx or .npy file, found by its header
+# - Fitting: maximum likelihood on whole arrays; gamma and Weibull solve their likelihood equations with
+#   Newton's method, every step a pass over the data
+# - Testing: chi-square with neighbouring bins merged until each expects MIN_EXPECTED observations, and
+#   Kolmogorov-Smirnov for the continuous fits. Both p-values come from tables for known parameters, so
+#   with fitted parameters they lean towards accepting.
+# - Ranking: by chi-square p-value; the best fits become the parameters of the matching simulator
+# Run "python Fitting.py file arrival-column service-column [servers customers]" for a report; the columns
+# of the shop workbook are "Interarrival Time" and "Service Duration".
+# Distributions that cannot take the data, like a gamma for inter-arrival times of 0, are skipped.
+DISTRIBUTIONS = ["Poisson", "Exponential", "Normal", "Uniform", "Gamma", "Lognormal", "Weibull"]
+# The simulators draw Poisson counts only for inter-arrival times
+SERVICE_DISTRIBUTIONS = DISTRIBUTIONS[1:]
+PARAMETER_NAMES = {"Poisson": ["lambda"], "Exponential": ["scale"], "Normal": ["mean", "sigma"],
+                   "Uniform": ["a", "b"], "Gamma": ["shape", "scale"], "Lognormal": ["mean", "sigma"],
+                   "Weibull": ["shape", "scale"]}
+MIN_EXPECTED = 5
+ALPHA = 0.05
+NEWTON_STEPS = 100
+REPLICATIONS = 10
+XLSX_NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+# --- Loading ---
+def xlsx_column(path, column):
+    # One column of the first sheet of a workbook, read with the standard library; text cells become NaN
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(path) as book:
+        strings = []
+        if "xl/sharedStrings.xml" in book.namelist():
+            root = ElementTree.parse(book.open("xl/sharedStrings.xml")).getroot()
+            strings = ["".join(text.text or "" for text in item.iter(XLSX_NAMESPACE + "t")) for item in root]
+        letters = None
+        values = []
+        for _, row in ElementTree.iterparse(book.open("xl/worksheets/sheet1.xml")):
+            if row.tag != XLSX_NAMESPACE + "row":
+                continue
+            cells = {}
+            for cell in row.iter(XLSX_NAMESPACE + "c"):
+                value = cell.find(XLSX_NAMESPACE + "v")
+                if value is not None:
+                    text = strings[int(value.text)] if cell.get("t") == "s" else value.text
+                    cells["".join(filter(str.isalpha, cell.get("r")))] = (cell.get("t"), text)
+            if letters is None:
+                # The first row holds the headers
+                header = {text.strip(): key for key, (_, text) in cells.items()}
+                if column not in header:
+                    raise ValueError(f"No column {column!r}; the columns are {', '.join(header)}.")
+                letters = header[column]
+            else:
+                kind, text = cells.get(letters, ("s", None))
+                values.append(float(text) if kind in (None, "n") else math.nan)
+            row.clear()
+    return np.array(values)
+
+
+def csv_column(path, column):
+    with open(path, newline="") as file:
+        header = [name.strip() for name in next(csv.reader(file))]
+    if column not in header:
+        raise ValueError(f"No column {column!r}; the columns are {', '.join(header)}.")
+    return np.loadtxt(path, delimiter=",", skiprows=1, usecols=header.index(column), ndmin=1)
+
+
+def load_column(path, column):
+    # The numbers of one column, without empty cells
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        values = xlsx_column(path, column)
+    elif extension in (".csv", ".txt"):
+        values = csv_column(path, column)
+    elif extension == ".npy":
+        # A structured array, like the tables of LCG.write_table, or a plain one
+        values = np.load(path, mmap_mode="r")
+        values = values[column] if values.dtype.names else values
+    else:
+        raise ValueError("Load the data from a .csv, .xlsx or .npy file.")
+    values = np.asarray(values, dtype=float)
+    return values[~np.isnan(values)]
+
+
+# --- Special functions ---
+def regularized_gamma(s, x):
+    # Lower regularized incomplete gamma P(s, x) for an array of x, with the series and continued fraction
+    # of Stats.gamma_q run on whole arrays
+    x = np.asarray(x, dtype=float)
+    p = np.zeros(x.shape)
+    series = (x > 0) & (x < s + 1)
+    xs = x[series]
+    term = np.full(len(xs), 1 / s)
+    total = term.copy()
+    k = s
+    while (term > total * 1e-16).any():
+        k += 1
+        term *= xs / k
+        total += term
+    p[series] = np.exp(s * np.log(xs) - xs - math.lgamma(s)) * total
+
+    fraction = x >= s + 1
+    xf = x[fraction]
+    tiny = 1e-300
+    b = xf + 1 - s
+    c = np.full(len(xf), 1 / tiny)
+    d = 1 / b
+    h = d.copy()
+    for i in range(1, 100000):
+        an = -i * (i - s)
+        b += 2
+        d = an * d + b
+        d[np.abs(d) < tiny] = tiny
+        c = b + an / c
+        c[np.abs(c) < tiny] = tiny
+        d = 1 / d
+        h *= d * c
+        if (np.abs(d * c - 1) < 1e-15).all():
+            break
+    p[fraction] = 1 - np.exp(s * np.log(xf) - xf - math.lgamma(s)) * h
+    return np.clip(p, 0.0, 1.0)
+
+
+def normal_cdf(z):
+    # P(Z <= z) = (1 + P(1/2, z^2 / 2)) / 2 for z >= 0
+    return 0.5 * (1 + np.sign(z) * regularized_gamma(0.5, z * z / 2))
+
+
+def digamma(x):
+    # Shifted up past 10 by the recurrence, then the asymptotic series
+    result = 0.0
+    while x < 10:
+        result -= 1 / x
+        x += 1
+    f = 1 / (x * x)
+    return result + math.log(x) - 0.5 / x - f * (1 / 12 - f * (1 / 120 - f * (1 / 252 - f * (1 / 240 - f / 132))))
+
+
+def trigamma(x):
+    result = 0.0
+    while x < 10:
+        result += 1 / (x * x)
+        x += 1
+    f = 1 / (x * x)
+    return result + 1 / x + f / 2 + f / x * (1 / 6 - f * (1 / 30 - f * (1 / 42 - f / 30)))
+
+
+# --- Maximum likelihood ---
+# Every fit returns its parameters in the order of PARAMETER_NAMES, which is also the order of Engine
+def positive_data(x, distribution):
+    nonpositive = int((x <= 0).sum())
+    if nonpositive:
+        raise ValueError(f"{distribution} needs data greater than 0, and {nonpositive} of the {len(x)} values "
+                         f"{'is' if nonpositive == 1 else 'are'} 0 or less.")
+
+
+def fit_poisson(x):
+    if x.min() < 0 or (x != np.round(x)).any():
+        raise ValueError("Poisson needs whole numbers of at least 0.")
+    return (x.mean(),)
+
+
+def fit_exponential(x):
+    if x.min() < 0:
+        raise ValueError("Exponential needs data of at least 0.")
+    return (x.mean(),)
+
+
+def fit_normal(x):
+    return x.mean(), x.std()
+
+
+def fit_uniform(x):
+    return x.min(), x.max()
+
+
+def fit_gamma(x):
+    # The shape solves log(shape) - digamma(shape) = log(mean) - mean of log x; Minka's closed form
+    # starts Newton's method within a few percent of it
+    positive_data(x, "Gamma")
+    mean = x.mean()
+    s = math.log(mean) - np.log(x).mean()
+    shape = (3 - s + math.sqrt((s - 3) ** 2 + 24 * s)) / (12 * s)
+    for _ in range(NEWTON_STEPS):
+        step = (math.log(shape) - digamma(shape) - s) / (1 / shape - trigamma(shape))
+        shape = shape - step if step < shape else shape / 2
+        if abs(step) < 1e-12 * shape:
+            break
+    return shape, mean / shape
+
+
+def fit_lognormal(x):
+    positive_data(x, "Lognormal")
+    logs = np.log(x)
+    return logs.mean(), logs.std()
+
+
+def fit_weibull(x):
+    # The shape k solves sum(x^k log x) / sum(x^k) - 1 / k = mean of log x, whose left side grows with k,
+    # so Newton's method is kept inside the bracket of the last guesses on either side. The data are
+    # divided by their largest value first, which keeps every x^k within (0, 1].
+    positive_data(x, "Weibull")
+    top = x.max()
+    logs = np.log(x / top)
+    squares = logs * logs
+    mean_log = logs.mean()
+    shape = math.pi / (math.sqrt(6) * logs.std())   # from the variance of log x
+    low, high = 0.0, math.inf
+    for _ in range(NEWTON_STEPS):
+        powers = np.exp(shape * logs)
+        total = powers.sum()
+        first = powers @ logs / total
+        g = first - 1 / shape - mean_log
+        if g > 0:
+            high = shape
+        else:
+            low = shape
+        new = shape - g / (powers @ squares / total - first ** 2 + 1 / shape ** 2)
+        if not low < new < high:
+            new = (low + high) / 2 if high < math.inf else 2 * shape
+        if abs(new - shape) < 1e-12 * shape:
+            shape = new
+            break
+        shape = new
+    return shape, top * np.exp(shape * logs).mean() ** (1 / shape)
+
+
+FITS = {"Poisson": fit_poisson, "Exponential": fit_exponential, "Normal": fit_normal, "Uniform": fit_uniform,
+        "Gamma": fit_gamma, "Lognormal": fit_lognormal, "Weibull": fit_weibull}
+
+
+def cdf(distribution, params, x):
+    # P(X <= x) of the continuous distributions
+    if distribution == "Exponential":
+        return 1 - np.exp(-np.maximum(x, 0) / params[0])
+    if distribution == "Normal":
+        mean, sigma = params
+        return normal_cdf((x - mean) / sigma)
+    if distribution == "Uniform":
+        a, b = params
+        return np.clip((x - a) / (b - a), 0.0, 1.0)
+    if distribution == "Gamma":
+        shape, scale = params
+        return regularized_gamma(shape, np.maximum(x, 0) / scale)
+    if distribution == "Lognormal":
+        mean, sigma = params
+        positive = x > 0
+        return np.where(positive, normal_cdf((np.log(np.where(positive, x, 1)) - mean) / sigma), 0.0)
+    if distribution == "Weibull":
+        shape, scale = params
+        return 1 - np.exp(-(np.maximum(x, 0) / scale) ** shape)
+    raise ValueError(f"Unsupported distribution: {distribution}")
+
+
+def poisson_probabilities(lmbda, largest):
+    # P(X = k) for k = 0 .. largest - 1, and P(X >= largest) last
+    k = np.arange(largest + 1)
+    pmf = np.exp(k * math.log(lmbda) - lmbda - np.cumsum(np.log(np.maximum(k, 1))))
+    pmf[-1] = max(0.0, 1 - pmf[:-1].sum())
+    return pmf
+
+
+# --- Goodness of fit ---
+def merge_bins(observed, expected):
+    # Neighbouring bins are merged from the left until each expects at least MIN_EXPECTED observations;
+    # a short remainder at the right end joins the last merged bin
+    merged_observed, merged_expected = [], []
+    count = expect = 0.0
+    for o, e in zip(observed.tolist(), expected.tolist()):
+        count += o
+        expect += e
+        if expect >= MIN_EXPECTED:
+            merged_observed.append(count)
+            merged_expected.append(expect)
+            count = expect = 0.0
+    if merged_expected:
+        merged_observed[-1] += count
+        merged_expected[-1] += expect
+    else:
+        merged_observed.append(count)
+        merged_expected.append(expect)
+    return np.array(merged_observed), np.array(merged_expected)
+
+
+def chi_square_test(observed, expected, fitted):
+    # (statistic, degrees of freedom, p-value); one degree of freedom is lost per fitted parameter
+    observed, expected = merge_bins(observed, expected)
+    df = len(observed) - 1 - fitted
+    if df < 1:
+        return math.nan, df, math.nan
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    return statistic, df, chi2_sf(statistic, df)
+
+
+def ks_test(values, counts, distribution, params):
+    # Kolmogorov-Smirnov from the distinct values and their counts, which handles ties exactly
+    F = cdf(distribution, params, values)
+    n = counts.sum()
+    upper = np.cumsum(counts) / n
+    lower = upper - counts / n
+    d = float(max((upper - F).max(), (F - lower).max()))
+    return d, kolmogorov_sf(d, n)
+
+
+def data_bins(values, counts):
+    # Interior bin edges and observed counts of the continuous tests, shared by all the fits
+    # 2 n^(2/5) equal-width bins; whole-number data, like the times the simulators round up, get
+    # whole-number edges, so each value v stands for the interval (v - 1, v]
+    n = counts.sum()
+    bins = math.ceil(2 * n ** 0.4)
+    edges = np.linspace(values[0], values[-1], bins + 1)[1:-1]
+    if (values == np.round(values)).all():
+        edges = np.unique(np.ceil(edges))
+    observed = np.bincount(np.searchsorted(edges, values), weights=counts, minlength=len(edges) + 1)
+    return edges, observed
+
+
+def fit_all(x, distributions=DISTRIBUTIONS):
+    # One row per distribution, best first: parameters, chi-square and K-S results, or under "Skipped"
+    # the reason it does not apply
+    x = np.asarray(x, dtype=float)
+    if len(x) < 2 or x.min() == x.max():
+        raise ValueError("Fitting needs at least two different values.")
+    values, counts = np.unique(x, return_counts=True)
+    edges, observed = data_bins(values, counts)
+    rows = []
+    for distribution in distributions:
+        row = {"Distribution": distribution}
+        try:
+            params = tuple(float(value) for value in FITS[distribution](x))
+        except ValueError as e:
+            row["Skipped"] = str(e)
+            rows.append(row)
+            continue
+        if distribution == "Poisson":
+            counted = np.bincount(values.astype(np.int64), weights=counts)
+            expected = len(x) * poisson_probabilities(params[0], len(counted) - 1)
+            statistic, df, p = chi_square_test(counted, expected, len(params))
+            d = ks_p = None
+        else:
+            expected = len(x) * np.diff(np.concatenate(([0.0], cdf(distribution, params, edges), [1.0])))
+            statistic, df, p = chi_square_test(observed, expected, len(params))
+            d, ks_p = ks_test(values, counts, distribution, params)
+        row.update({"Parameters": params, "Chi-square": statistic, "df": df, "p-value": p,
+                    "K-S D": d, "K-S p-value": ks_p})
+        rows.append(row)
+    rows.sort(key=rank)
+    return rows
+
+
+def rank(row):
+    # Highest p-value first; with many observations every p-value can be 0, and then the smaller
+    # chi-square per degree of freedom wins. Fits without a test come last.
+    if "Skipped" in row:
+        return 2, 0, 0
+    if math.isnan(row["p-value"]):
+        return 1, 0, 0
+    return 0, -row["p-value"], row["Chi-square"] / row["df"]
+
+
+def best_fit(rows):
+    # (distribution, params) of the best-ranked fit
+    for row in rows:
+        if "Skipped" not in row:
+            return row["Distribution"], row["Parameters"]
+    raise ValueError("None of the distributions fit the data.")
+
+
+# --- Simulator inputs ---
+def engine_distribution(distribution, params):
+    # (distribution, params) for Engine.distribution_times; an exponential is a gamma of shape 1
+    if distribution == "Exponential":
+        return "Gamma", (1.0, params[0])
+    if distribution == "Poisson":
+        raise ValueError("Only inter-arrival times can be Poisson in the simulators.")
+    return distribution, tuple(params)
+
+
+def simulator_params(arrival, service, servers, customers):
+    # Model and positional arguments of Engine.run_mmc / run_mgc / run_ggc (and Replications) for the
+    # chosen arrival and service fits, each a (distribution, params) pair
+    # Poisson inter-arrival times go to MMC or MGC, which draw them with mean lambda. MMC draws service
+    # times as Exp(mean 1 / mu) in tenths, so a fitted mean service time of scale is mu = 10 / scale.
+    arrival_distribution, arrival_params = arrival
+    service_distribution, service_params = service
+    if arrival_distribution == "Poisson":
+        if service_distribution == "Exponential":
+            return "MMC", (arrival_params[0], 10 / service_params[0], servers, customers)
+        return "MGC", (arrival_params[0], servers, customers, *engine_distribution(service_distribution,
+                                                                                  service_params))
+    return "GGC", (*engine_distribution(arrival_distribution, arrival_params), servers, customers,
+                   *engine_distribution(service_distribution, service_params))
+
+
+# --- Report ---
+def format_number(value, spec):
+    return "-" if value is None or math.isnan(value) else format(value, spec)
+
+
+def format_fits(rows, alpha=ALPHA):
+    lines = [f"{'Distribution':<13}{'Parameters':<36}{'Chi-square':>12}{'df':>5}{'p-value':>10}"
+             f"{'K-S D':>9}{'K-S p':>9}  Result"]
+    for row in rows:
+        if "Skipped" in row:
+            lines.append(f"{row['Distribution']:<13}skipped: {row['Skipped']}")
+            continue
+        params = ", ".join(f"{name}={value:.4g}" for name, value in zip(PARAMETER_NAMES[row["Distribution"]],
+                                                                       row["Parameters"]))
+        result = "-" if math.isnan(row["p-value"]) else "ACCEPT" if row["p-value"] >= alpha else "REJECT"
+        lines.append(f"{row['Distribution']:<13}{params:<36}{format_number(row['Chi-square'], '.3f'):>12}"
+                     f"{row['df'] if row['df'] >= 1 else '-':>5}{format_number(row['p-value'], '.4f'):>10}"
+                     f"{format_number(row['K-S D'], '.4f'):>9}{format_number(row['K-S p-value'], '.4f'):>9}  {result}")
+    return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) < 4:
+        print("Usage: python Fitting.py file arrival-column service-column [servers customers]")
+        print('For the shop data: python Fitting.py "../Collected Data and Chi square/'
+              'car_mechanic_shop_arrivals_pst.xlsx" "Interarrival Time" "Service Duration"')
+        return
+    path, arrival_column, service_column = sys.argv[1:4]
+    chosen = []
+    for column, distributions in [(arrival_column, DISTRIBUTIONS), (service_column, SERVICE_DISTRIBUTIONS)]:
+        data = load_column(path, column)
+        rows = fit_all(data, distributions)
+        print(f"{column}: {len(data)} values, mean {data.mean():.4g}, standard deviation {data.std():.4g}")
+        print(format_fits(rows))
+        print()
+        chosen.append(best_fit(rows))
+
+    servers = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    customers = int(sys.argv[5]) if len(sys.argv) > 5 else 1000
+    model, params = simulator_params(*chosen, servers, customers)
+    print(f"Simulator: {model} with {params}")
+    if len(sys.argv) > 5:
+        from Replications import run_replications
+
+        summary = run_replications(model, params, REPLICATIONS, seed=2024)
+        for metric, values in summary.items():
+            print(f"{metric:<18}{values['Mean']:>12.2f}  95% CI {values['CI Low']:.2f} .. {values['CI High']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+from functools import lru_cache
+
+
+# Images live next to the scripts, whatever the current working directory is
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def load_image(name, size):
+    # Open, resize and convert an image once; every window reuses the same PhotoImage
+    # The cache also keeps the reference Tkinter needs to keep showing the image
+    from PIL import Image, ImageTk  # For handling images
+
+    image = Image.open(os.path.join(BASE_DIR, name))
+    image = image.resize(size, Image.Resampling.LANCZOS)
+    return ImageTk.PhotoImage(image)
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+
+# Import-time regression check: run "python Import_Budget.py [budget in ms]" from anywhere
+# Every module must import without a display, without the plotting/GUI packages and within the budget
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_MS = 100
+REPEAT = 3
+MODULES = ["Queuing_Cal", "Engine", "Stats", "Replications", "Table_View", "Charts", "Images", "Queue_Vector", "Erlang", "Staffing", "Queue_Cache",
+           "Transient", "Random_Source", "LCG_Battery", "Fitting", "MMC", "MGC", "GGC", "Simulator", "LCG"]
+# Only loaded once a chart, an image or a table is actually requested
+LAZY_PACKAGES = ["matplotlib", "PIL", "simpy", "tabulate"]
+# numpy is the numeric core of the engines; its own import cost is reported but not counted against the budget
+BASELINE_PACKAGES = ["numpy"]
+
+
+def import_times(module):
+    # Cumulative import time (microseconds) of every module loaded by "import module"
+    # and the names of all the modules it left loaded
+    code = f"import {module}, sys; print(' '.join(sys.modules))"
+    env = dict(os.environ)
+    env.pop("DISPLAY", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module that triggered them; keep the first time each is seen
+        if cumulative.strip().isdigit():
+            times.setdefault(name.strip(), int(cumulative))
+    return times, set(proc.stdout.split())
+
+
+def check_module(module, budget_ms=BUDGET_MS, repeat=REPEAT):
+    # Best of several runs, so a cold disk cache or a busy machine does not fail the check
+    best_total, best_baseline, loaded = None, 0, set()
+    for _ in range(repeat):
+        times, loaded = import_times(module)
+        baseline = sum(times.get(name, 0) for name in BASELINE_PACKAGES)
+        total = times[module] - baseline
+        if best_total is None or total < best_total:
+            best_total, best_baseline = total, baseline
+
+    lazy = [name for name in LAZY_PACKAGES if name in loaded]
+    total_ms = best_total / 1000
+    errors = []
+    if total_ms > budget_ms:
+        errors.append(f"{total_ms:.1f} ms is over the {budget_ms} ms budget")
+    if lazy:
+        errors.append("imports " + ", ".join(lazy) + " at import time")
+    return total_ms, best_baseline / 1000, errors
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    failures = 0
+    print(f"{'Module':<14}{'Import (ms)':>12}{'numpy (ms)':>12}  Result")
+    for module in MODULES:
+        try:
+            total_ms, baseline_ms, errors = check_module(module, budget_ms)
+        except RuntimeError as e:
+            total_ms, baseline_ms, errors = float("nan"), 0, [str(e)]
+        failures += bool(errors)
+        print(f"{module:<14}{total_ms:>12.1f}{baseline_ms:>12.1f}  {'; '.join(errors) or 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,8 +48,57 @@
 # =================================================================================================================================
 
 
+import os
 import tkinter as tk
-from tabulate import tabulate
+import numpy as np
+
+
+# --- Block generation ---
+# x(k + 1) = (a x(k) + c) mod m is an affine map, and k steps of it are again one affine map
+# x(k) = (A x(0) + C) mod m. That gives jumps of any length in O(log k) and lets a whole block be
+# filled with a few array operations instead of one Python call per number.
+def affine_power(a, c, m, k):
+    # (A, C) of k steps, by repeated squaring of the one-step map
+    A, C = 1 % m, 0
+    step_a, step_c = a % m, c % m
+    while k:
+        if k & 1:
+            A, C = (step_a * A) % m, (step_a * C + step_c) % m
+        step_a, step_c = (step_a * step_a) % m, (step_a * step_c + step_c) % m
+        k >>= 1
+    return A, C
+
+
+def block_dtype(m):
+    # uint64 whenever the products can be reduced exactly: below 2^32 nothing overflows, and for a power
+    # of two up to 2^64 the wrap-around of uint64 is itself the modulus. Anything else uses Python ints.
+    if m <= 2**32 or (m <= 2**64 and m & (m - 1) == 0):
+        return np.uint64
+    return object
+
+
+def affine_map(x, A, C, m):
+    if x.dtype == object:
+        return (x * A + C) % m
+    if m > 2**32:
+        return (np.uint64(A) * x + np.uint64(C)) & np.uint64(m - 1)
+    return (np.uint64(A) * x + np.uint64(C)) % np.uint64(m)
+
+
+def affine_block(seed, a, c, m, n):
+    # The n values that follow seed. Once the first length values are known, the next length values are
+    # the same map jumped ahead by length, so the filled prefix doubles with every array operation.
+    values = np.empty(n, dtype=block_dtype(m))
+    if n == 0:
+        return values
+    values[0] = (a * seed + c) % m
+    length = 1
+    while length < n:
+        A, C = affine_power(a, c, m, length)
+        take = min(length, n - length)
+        values[length:length + take] = affine_map(values[:take], A, C, m)
+        length += take
+    return values
 
 
 class LCG:
@@ -71,53 +120,323 @@ class LCG:
         self.priority = (3 - 1) * self.random + 1
         return round(self.priority)
 
+    # The methods below give exactly the numbers of repeated next() calls
+    def block(self, n):
+        # The next n values of next() as an array
+        values = affine_block(self.seed, self.a, self.c, self.m, n)
+        if n:
+            self.seed = int(values[-1])
+        return values
+
+    def random_block(self, n):
+        # The next n values of randomNumber(), the same floats as one call at a time while m <= 2^53
+        return self.block(n).astype(float) / self.m
+
+    def jump(self, k):
+        # Skip k numbers in O(log k) steps
+        if k:
+            A, C = affine_power(self.a, self.c, self.m, k)
+            self.seed = (A * self.seed + C) % self.m
+
+    def substreams(self, count, length):
+        # count generators for parallel workers: stream i starts i * length numbers after this one, so
+        # none overlap while each draws at most length numbers and count * length stays within the period
+        A, C = affine_power(self.a, self.c, self.m, length)
+        streams = []
+        seed = self.seed
+        for _ in range(count):
+            streams.append(LCG(seed, self.a, self.c, self.m))
+            seed = (A * seed + C) % self.m
+        return streams
+
+
+# --- Combined multiple-recursive generator ---
+# L'Ecuyer's MRG32k3a combines two order-3 recurrences
+#     x1(n) = (1403580 x1(n - 2) - 810728 x1(n - 3)) mod m1
+#     x2(n) = (527612 x2(n - 1) - 1370589 x2(n - 3)) mod m2
+# into u(n) = ((x1(n) - x2(n)) mod m1) / (m1 + 1), with a period near 2^191 and good structure up to 45
+# dimensions. Each state (x(n - 3), x(n - 2), x(n - 1)) moves by a 3 x 3 matrix, so like the LCG it jumps
+# ahead by a matrix power. The period is cut into streams of 2^127 numbers, and every stream into
+# substreams of 2^76, so replications and workers can each take a stream that never meets another.
+MRG_M1 = 2**32 - 209
+MRG_M2 = 2**32 - 22853
+MRG_A1 = [[0, 1, 0], [0, 0, 1], [MRG_M1 - 810728, 1403580, 0]]
+MRG_A2 = [[0, 1, 0], [0, 0, 1], [MRG_M2 - 1370589, 0, 527612]]
+MRG_DEFAULT_SEED = (12345,) * 6
+STREAM_LENGTH = 2**127
+SUBSTREAM_LENGTH = 2**76
+
+
+def matrix_product(A, B, m):
+    return [[sum(A[i][k] * B[k][j] for k in range(3)) % m for j in range(3)] for i in range(3)]
+
+
+def matrix_power(A, k, m):
+    result = [[int(i == j) for j in range(3)] for i in range(3)]
+    while k:
+        if k & 1:
+            result = matrix_product(A, result, m)
+        A = matrix_product(A, A, m)
+        k >>= 1
+    return result
+
+
+def matrix_vector(A, x, m):
+    return [sum(A[i][k] * x[k] for k in range(3)) % m for i in range(3)]
+
+
+# Jump matrices of one stream and one substream for both components
+MRG_STREAM_JUMP = (matrix_power(MRG_A1, STREAM_LENGTH, MRG_M1), matrix_power(MRG_A2, STREAM_LENGTH, MRG_M2))
+MRG_SUBSTREAM_JUMP = (matrix_power(MRG_A1, SUBSTREAM_LENGTH, MRG_M1),
+                      matrix_power(MRG_A2, SUBSTREAM_LENGTH, MRG_M2))
+
+
+def recurrence_block(state, A, m, n):
+    # The state followed by the next n values of one component. Block generation works as for the LCG:
+    # with the first K values known, the first row of A^(K - 2) maps every three consecutive values to the
+    # value K - 2 places on, which nearly doubles the known prefix per array operation. All entries are
+    # below 2^32, so every product fits in a uint64 before it is reduced.
+    values = np.empty(n + 3, dtype=np.uint64)
+    values[:3] = state
+    known = min(n + 3, 8)
+    for i in range(3, known):
+        values[i] = sum(A[2][k] * int(values[i - 3 + k]) for k in range(3)) % m
+    modulus = np.uint64(m)
+    while known < n + 3:
+        row = [np.uint64(entry) for entry in matrix_power(A, known - 2, m)[0]]
+        take = min(known - 4, n + 3 - known)
+        values[known:known + take] = ((row[0] * values[2:take + 2]) % modulus + (row[1] * values[3:take + 3]) % modulus
+                                      + (row[2] * values[4:take + 4]) % modulus) % modulus
+        known += take
+    return values
+
+
+class MRG32k3a:
+    def __init__(self, seed=MRG_DEFAULT_SEED):
+        # seed is either the six starting values, three below m1 and three below m2 with neither three all
+        # zero, or one whole number that is spread over the six values
+        if np.ndim(seed) == 0:
+            values = np.random.SeedSequence(int(seed)).generate_state(6, np.uint64)
+            seed = [int(value) % (m - 1) + 1 for value, m in zip(values, [MRG_M1] * 3 + [MRG_M2] * 3)]
+        seed = [int(value) for value in seed]
+        if (len(seed) != 6 or min(seed) < 0 or max(seed[:3]) >= MRG_M1 or max(seed[3:]) >= MRG_M2
+                or not any(seed[:3]) or not any(seed[3:])):
+            raise ValueError("The MRG32k3a seed needs three values below m1 and three below m2, "
+                             "with neither three all 0.")
+        self.state1 = seed[:3]
+        self.state2 = seed[3:]
+
+    def random(self):
+        # One uniform in (0, 1), as in L'Ecuyer's reference implementation
+        x1 = (1403580 * self.state1[1] - 810728 * self.state1[0]) % MRG_M1
+        x2 = (527612 * self.state2[2] - 1370589 * self.state2[0]) % MRG_M2
+        self.state1 = self.state1[1:] + [x1]
+        self.state2 = self.state2[1:] + [x2]
+        return (x1 - x2 if x1 > x2 else x1 - x2 + MRG_M1) / (MRG_M1 + 1)
+
+    def random_block(self, n):
+        # The next n values of random() as an array
+        x1 = recurrence_block(self.state1, MRG_A1, MRG_M1, n)
+        x2 = recurrence_block(self.state2, MRG_A2, MRG_M2, n)
+        self.state1 = [int(value) for value in x1[-3:]]
+        self.state2 = [int(value) for value in x2[-3:]]
+        z = x1[3:].astype(np.int64) - x2[3:].astype(np.int64)
+        return np.where(z > 0, z, z + MRG_M1) / (MRG_M1 + 1)
+
+    def jump(self, k):
+        # Skip k numbers in O(log k) steps
+        self.state1 = matrix_vector(matrix_power(MRG_A1, k, MRG_M1), self.state1, MRG_M1)
+        self.state2 = matrix_vector(matrix_power(MRG_A2, k, MRG_M2), self.state2, MRG_M2)
+
+    def advanced(self, jumps, count):
+        # A new generator count jumps ahead of this one, from the precomputed jump matrices
+        generator = MRG32k3a(self.state1 + self.state2)
+        generator.state1 = matrix_vector(matrix_power(jumps[0], count, MRG_M1), self.state1, MRG_M1)
+        generator.state2 = matrix_vector(matrix_power(jumps[1], count, MRG_M2), self.state2, MRG_M2)
+        return generator
+
+    def stream(self, i):
+        # Generator i streams after this one; replication or worker i takes stream(i)
+        return self.advanced(MRG_STREAM_JUMP, i)
+
+    def substream(self, i):
+        # Generator i substreams after this one, for splitting a stream further
+        return self.advanced(MRG_SUBSTREAM_JUMP, i)
+
+    def streams(self, count):
+        return [self.stream(i) for i in range(count)]
 
-def create_lcg():
-    seed = int(seed_entry.get())
-    a = int(a_entry.get())
-    c = int(c_entry.get())
-    m = int(m_entry.get())
-    n = int(n_entry.get())
+    def substreams(self, count):
+        return [self.substream(i) for i in range(count)]
 
+
+# --- Table output ---
+# The table of create_lcg, one row per number. Rows are generated and written a chunk at a time, so a tape of
+# any length only ever holds one chunk in memory; the grid printout is kept for the first GRID_LIMIT rows.
+TABLE_COLUMNS = ["Simulation", "Initial Seed", "LCG(initial Seed)", "Random Number", "Priority"]
+GRID_LIMIT = 1000
+CHUNK_ROWS = 2**18
+TABLE_FORMATS = [".csv", ".npy", ".parquet"]
+
+
+def table_chunks(seed, a, c, m, n, chunk_rows=CHUNK_ROWS):
+    # The n rows as chunks of column arrays; every row starts from the value of the row before
     lcg = LCG(seed, a, c, m)
-    table = [["Simulation", "Initial Seed",
-              "LCG(initial Seed)", "Random Number", "Priority"]]
-    for i in range(n):
-        temp = []
-        temp.append(i + 1)
-        temp.append(lcg.seed)
-        temp.append(lcg.next())
-        temp.append(lcg.randomNumber())
-        temp.append(lcg.getPriority())
-        table.append(temp)
-
-    print(tabulate(table, headers="firstrow", tablefmt="grid"))
-
-
-root = tk.Tk()
-root.title("LCG Parameters")
-root.geometry("400x300")
-
-tk.Label(root, text="Seed").grid(row=0, padx=20, pady=10)
-tk.Label(root, text="a").grid(row=1, padx=20, pady=10)
-tk.Label(root, text="c").grid(row=2, padx=20, pady=10)
-tk.Label(root, text="m").grid(row=3, padx=20, pady=10)
-tk.Label(root, text="n").grid(row=4, padx=20, pady=10)
-
-seed_entry = tk.Entry(root)
-a_entry = tk.Entry(root)
-c_entry = tk.Entry(root)
-m_entry = tk.Entry(root)
-n_entry = tk.Entry(root)
-
-seed_entry.grid(row=0, column=1, padx=20, pady=10)
-a_entry.grid(row=1, column=1, padx=20, pady=10)
-c_entry.grid(row=2, column=1, padx=20, pady=10)
-m_entry.grid(row=3, column=1, padx=20, pady=10)
-n_entry.grid(row=4, column=1, padx=20, pady=10)
-
-
-tk.Button(root, text='Submit', command=create_lcg).grid(
-    row=5, column=1, sticky=tk.W, pady=20, padx=20)
-
-root.mainloop()
+    for start in range(0, n, chunk_rows):
+        initial = lcg.seed
+        values = lcg.block(min(chunk_rows, n - start))
+        simulations = np.arange(start + 1, start + len(values) + 1)
+        # The entered seed can be outside [0, m), and then only fits in a Python int
+        fits = values.dtype == object or 0 <= initial < 2**64
+        initials = np.concatenate((np.array([initial], dtype=values.dtype if fits else object), values[:-1]))
+        # The same floats as value / m: Python ints divide exactly, uint64 values are exact floats below 2^32,
+        # and for a power of two m the conversion rounds once and the division by m is exact
+        randoms = np.asarray(values / m if values.dtype == object else values.astype(float) / m, dtype=float)
+        priorities = np.round((3 - 1) * randoms + 1).astype(np.int64)
+        yield simulations, initials, values, randoms, priorities
+
+
+def write_csv(path, chunks):
+    with open(path, "w", newline="") as file:
+        file.write(",".join(TABLE_COLUMNS) + "\n")
+        for simulations, initials, values, randoms, priorities in chunks:
+            # repr keeps every digit of the random numbers, so the tape reads back to the same floats
+            file.write("\n".join(map("{},{},{},{!r},{}".format, simulations.tolist(), initials.tolist(),
+                                     values.tolist(), randoms.tolist(), priorities.tolist())) + "\n")
+
+
+def table_dtype(seed, m):
+    # Binary tables store the numbers as uint64, so m and the seed have to fit
+    if block_dtype(m) == object or not 0 <= seed < 2**64:
+        raise ValueError("Binary tables need m and the seed to fit in 64 bits; save the table as .csv instead.")
+    return np.dtype([("Simulation", np.int64), ("Initial Seed", np.uint64), ("LCG(initial Seed)", np.uint64),
+                     ("Random Number", np.float64), ("Priority", np.int8)])
+
+
+def write_npy(path, chunks, dtype, n):
+    # One structured array, written through a memory map; np.load(path, mmap_mode="r")["Random Number"]
+    # reads a column back without loading the rest
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n,))
+    for columns in chunks:
+        start = columns[0][0] - 1
+        for name, column in zip(TABLE_COLUMNS, columns):
+            table[name][start:start + len(column)] = column
+    table.flush()
+    del table
+
+
+def write_parquet(path, chunks, dtype):
+    # Parquet is columnar and compressed, but needs the optional pyarrow package
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet output needs the pyarrow package; save the table as .csv or .npy instead.")
+    schema = pa.schema([(name, pa.from_numpy_dtype(dtype[name])) for name in TABLE_COLUMNS])
+    with pq.ParquetWriter(path, schema) as writer:
+        for columns in chunks:
+            writer.write_table(pa.table([column.astype(dtype[name]) for name, column in zip(TABLE_COLUMNS, columns)],
+                                        schema=schema))
+
+
+def write_table(path, seed, a, c, m, n, chunk_rows=CHUNK_ROWS):
+    # Writes the n-row table to path as CSV, NumPy (.npy) or Parquet, chosen by the file extension
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in TABLE_FORMATS:
+        raise ValueError("Save the table as a .csv, .npy or .parquet file.")
+    if n < 0:
+        raise ValueError("n must be at least 0.")
+    chunks = table_chunks(seed, a, c, m, n, chunk_rows)
+    if extension == ".csv":
+        write_csv(path, chunks)
+    elif extension == ".npy":
+        write_npy(path, chunks, table_dtype(seed, m), n)
+    else:
+        write_parquet(path, chunks, table_dtype(seed, m))
+
+
+def main():
+    def create_lcg():
+        seed = int(seed_entry.get())
+        a = int(a_entry.get())
+        c = int(c_entry.get())
+        m = int(m_entry.get())
+        n = int(n_entry.get())
+
+        # tabulate is only needed once a table is printed
+        from tabulate import tabulate
+
+        # Only the first GRID_LIMIT rows are printed; longer tables go to a file with Save Table
+        table = [TABLE_COLUMNS]
+        for columns in table_chunks(seed, a, c, m, min(n, GRID_LIMIT)):
+            table.extend(zip(*(column.tolist() for column in columns)))
+
+        print(tabulate(table, headers="firstrow", tablefmt="grid"))
+        if n > GRID_LIMIT:
+            print(f"Showing the first {GRID_LIMIT} of {n} rows; use Save Table to write them all to a file.")
+
+    def save_table():
+        from tkinter import filedialog, messagebox
+
+        seed = int(seed_entry.get())
+        a = int(a_entry.get())
+        c = int(c_entry.get())
+        m = int(m_entry.get())
+        n = int(n_entry.get())
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy", "*.npy"), ("Parquet", "*.parquet")])
+        if not path:
+            return
+        try:
+            write_table(path, seed, a, c, m, n)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        print(f"Saved {n} rows to {path}")
+
+    def test_lcg():
+        # Period, statistical and spectral checks of the entered parameters
+        from LCG_Battery import run_battery, format_report
+
+        seed = int(seed_entry.get())
+        a = int(a_entry.get())
+        c = int(c_entry.get())
+        m = int(m_entry.get())
+        print(format_report(run_battery(seed, a, c, m)))
+
+    root = tk.Tk()
+    root.title("LCG Parameters")
+    root.geometry("400x410")
+
+    tk.Label(root, text="Seed").grid(row=0, padx=20, pady=10)
+    tk.Label(root, text="a").grid(row=1, padx=20, pady=10)
+    tk.Label(root, text="c").grid(row=2, padx=20, pady=10)
+    tk.Label(root, text="m").grid(row=3, padx=20, pady=10)
+    tk.Label(root, text="n").grid(row=4, padx=20, pady=10)
+
+    seed_entry = tk.Entry(root)
+    a_entry = tk.Entry(root)
+    c_entry = tk.Entry(root)
+    m_entry = tk.Entry(root)
+    n_entry = tk.Entry(root)
+
+    seed_entry.grid(row=0, column=1, padx=20, pady=10)
+    a_entry.grid(row=1, column=1, padx=20, pady=10)
+    c_entry.grid(row=2, column=1, padx=20, pady=10)
+    m_entry.grid(row=3, column=1, padx=20, pady=10)
+    n_entry.grid(row=4, column=1, padx=20, pady=10)
+
+
+    tk.Button(root, text='Submit', command=create_lcg).grid(
+        row=5, column=1, sticky=tk.W, pady=20, padx=20)
+    tk.Button(root, text='Test Generator', command=test_lcg).grid(
+        row=6, column=1, sticky=tk.W, padx=20)
+    tk.Button(root, text='Save Table', command=save_table).grid(
+        row=7, column=1, sticky=tk.W, pady=20, padx=20)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import math
+import sys
+from fractions import Fraction
+import numpy as np
+from LCG import LCG, affine_block, affine_power
+from Stats import chi2_sf, normal_two_sided_p
+
+
+# Quality checks for the parameters of an LCG x(k + 1) = (a x(k) + c) mod m
+# - Period: the Hull-Dobell conditions (or the multiplicative ones when c = 0) checked from the factors
+#   of m, and the actual tail and cycle length of the seed found with Brent's algorithm
+# - Statistics on u = x / m: frequency, serial pairs, runs up and down and gap tests, all on whole arrays
+# - Spectral test: the largest distance between the planes that hold all pairs and triples of outputs
+# Run "python LCG_Battery.py seed a c m [sample size]" for a report.
+SAMPLE_SIZE = 2**21
+ALPHA = 0.01                  # a p-value below ALPHA or above 1 - ALPHA fails
+MAX_CYCLE_STEPS = 2**26       # Brent's search gives up after this many numbers
+CHUNK = 2**22                 # numbers generated at once while searching for the cycle
+FREQUENCY_BINS = 256
+SERIAL_CELLS = 64             # per axis, so 4096 cells for the pairs
+GAP_RANGE = (0.0, 0.5)
+GAP_CLASSES = 16              # gap lengths 0 .. 14 and 15 or more
+SPECTRAL_PASS = 0.1           # Knuth's threshold for the figure of merit
+
+
+# --- Period ---
+def is_prime(n):
+    # Miller-Rabin with the first 12 primes as bases, deterministic below 3.3 * 10^24
+    if n < 2:
+        return False
+    bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    for p in bases:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for base in bases:
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def find_divisor(n):
+    # A nontrivial divisor of the composite n (Pollard's rho, Brent's variant)
+    if n % 2 == 0:
+        return 2
+    for offset in range(1, n):
+        x = y = 2
+        d = 1
+        while d == 1:
+            x = (x * x + offset) % n
+            y = (y * y + offset) % n
+            y = (y * y + offset) % n
+            d = math.gcd(abs(x - y), n)
+        if d != n:
+            return d
+    return n
+
+
+def prime_factors(n):
+    # Distinct prime factors of n
+    factors = set()
+    for p in [2, 3, 5, 7, 11, 13]:
+        while n % p == 0:
+            factors.add(p)
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        n = stack.pop()
+        if is_prime(n):
+            factors.add(n)
+        else:
+            d = find_divisor(n)
+            stack += [d, n // d]
+    return sorted(factors)
+
+
+def period_conditions(a, c, m):
+    # The conditions for the longest possible period, and that period
+    a, c = a % m, c % m
+    if c != 0:
+        # Hull-Dobell: period m for every seed
+        factors = prime_factors(m)
+        conditions = [("c and m are coprime", math.gcd(c, m) == 1),
+                      ("a - 1 is divisible by every prime factor of m", all((a - 1) % p == 0 for p in factors)),
+                      ("a - 1 is divisible by 4 if m is", m % 4 != 0 or (a - 1) % 4 == 0)]
+        return conditions, m
+    if is_prime(m):
+        # Multiplicative generator with prime m: period m - 1 for every seed from 1 to m - 1
+        order_factors = prime_factors(m - 1)
+        return [("m is prime", True),
+                ("a is a primitive root of m", a != 0 and all(pow(a, (m - 1) // q, m) != 1 for q in order_factors))], m - 1
+    if m & (m - 1) == 0 and m >= 8:
+        # Multiplicative generator with m = 2^k: period m / 4 for odd seeds
+        return [("m is a power of 2", True), ("a mod 8 is 3 or 5", a % 8 in (3, 5))], m // 4
+    return [("c > 0, or m prime, or m a power of 2", False)], None
+
+
+def value_blocks(seed, a, c, m, count):
+    # The count values after seed, a chunk at a time
+    while count > 0:
+        block = affine_block(seed, a, c, m, min(CHUNK, count))
+        yield block
+        seed = int(block[-1])
+        count -= len(block)
+
+
+def find_value(start, a, c, m, count, target):
+    # Steps from start to the first of the next count values equal to target (None if there is none),
+    # and the last of those values
+    done = 0
+    for block in value_blocks(start, a, c, m, count):
+        hits = np.flatnonzero(block == target)
+        if len(hits):
+            return done + int(hits[0]) + 1, None
+        done += len(block)
+        last = int(block[-1])
+    return None, last
+
+
+def cycle_length(seed, a, c, m, max_steps=MAX_CYCLE_STEPS):
+    # (tail, period) of seed, x1, x2, ..., or None when no value comes back within max_steps numbers
+    # Brent: the tortoise waits at a value while the hare runs 1, 2, 4, ... steps past it; the first time
+    # the hare meets it, the distance is the period. Every run of the hare is one search over arrays.
+    tortoise, position, power = seed, 0, 1
+    while True:
+        period, last = find_value(tortoise, a, c, m, power, tortoise)
+        if period is not None:
+            break
+        if position + power >= max_steps:
+            return None
+        tortoise, position, power = last, position + power, power * 2
+
+    # The tail ends at the first position where x(i) = x(i + period)
+    A, C = affine_power(a, c, m, period)
+    ahead = (A * seed + C) % m
+    if ahead == seed:
+        return 0, period
+    tail = 0
+    for front, back in zip(value_blocks(seed, a, c, m, position + period), value_blocks(ahead, a, c, m, position + period)):
+        equal = np.flatnonzero(front == back)
+        if len(equal):
+            return tail + int(equal[0]) + 1, period
+        tail += len(front)
+    return tail, period
+
+
+# --- Statistical tests ---
+def chi_square(counts, expected):
+    if expected.sum() == 0:
+        # Nothing to count, e.g. a generator stuck outside the range of the gap test
+        return math.inf, 0.0
+    statistic = float(((counts - expected)**2 / expected).sum())
+    return statistic, chi2_sf(statistic, len(counts) - 1)
+
+
+def frequency_test(u, bins=FREQUENCY_BINS):
+    # Equal counts in equal bins of [0, 1)
+    counts = np.bincount((u * bins).astype(np.int64), minlength=bins)
+    return chi_square(counts, np.full(bins, len(u) / bins))
+
+
+def serial_test(u, cells=SERIAL_CELLS):
+    # Equal counts of non-overlapping pairs (u0, u1), (u2, u3), ... in a cells x cells grid
+    pairs = len(u) // 2
+    x = (u[0:2 * pairs:2] * cells).astype(np.int64)
+    y = (u[1:2 * pairs:2] * cells).astype(np.int64)
+    counts = np.bincount(x * cells + y, minlength=cells * cells)
+    return chi_square(counts, np.full(cells * cells, pairs / cells**2))
+
+
+def runs_test(u):
+    # Number of runs up and down against its mean (2n - 1) / 3 and variance (16n - 29) / 90; ties are dropped
+    steps = np.diff(u)
+    up = steps[steps != 0] > 0
+    n = len(up) + 1
+    runs = 1 + int(np.count_nonzero(up[1:] != up[:-1]))
+    z = (runs - (2 * n - 1) / 3) / math.sqrt((16 * n - 29) / 90)
+    return z, normal_two_sided_p(z)
+
+
+def gap_test(u, low=GAP_RANGE[0], high=GAP_RANGE[1], classes=GAP_CLASSES):
+    # Lengths of the gaps between values in [low, high) are geometric with p = high - low
+    p = high - low
+    hits = np.flatnonzero((u >= low) & (u < high))
+    gaps = np.minimum(np.diff(hits) - 1, classes - 1)
+    counts = np.bincount(gaps, minlength=classes)
+    probabilities = p * (1 - p)**np.arange(classes)
+    probabilities[-1] = (1 - p)**(classes - 1)
+    return chi_square(counts, len(gaps) * probabilities)
+
+
+# --- Spectral test ---
+def lll_reduce(basis, delta=Fraction(99, 100)):
+    # Lenstra-Lenstra-Lovasz reduction of integer row vectors, with exact fractions
+    basis = [list(row) for row in basis]
+
+    def dot(u, v):
+        return sum(x * y for x, y in zip(u, v))
+
+    def gram_schmidt():
+        orthogonal, mu = [], [[Fraction(0)] * len(basis) for _ in basis]
+        for i, row in enumerate(basis):
+            vector = [Fraction(x) for x in row]
+            for j in range(i):
+                mu[i][j] = dot(row, orthogonal[j]) / dot(orthogonal[j], orthogonal[j])
+                vector = [x - mu[i][j] * y for x, y in zip(vector, orthogonal[j])]
+            orthogonal.append(vector)
+        return orthogonal, mu
+
+    k = 1
+    orthogonal, mu = gram_schmidt()
+    while k < len(basis):
+        for j in range(k - 1, -1, -1):
+            q = round(mu[k][j])
+            if q:
+                basis[k] = [x - q * y for x, y in zip(basis[k], basis[j])]
+                orthogonal, mu = gram_schmidt()
+        if dot(orthogonal[k], orthogonal[k]) >= (delta - mu[k][k - 1]**2) * dot(orthogonal[k - 1], orthogonal[k - 1]):
+            k += 1
+        else:
+            basis[k], basis[k - 1] = basis[k - 1], basis[k]
+            orthogonal, mu = gram_schmidt()
+            k = max(k - 1, 1)
+    return basis
+
+
+def spectral_test(a, m, dimensions):
+    # Length nu of the shortest nonzero (s1, ..., st) with s1 + a s2 + ... + a^(t-1) st = 0 mod m;
+    # successive t-tuples of outputs lie on parallel planes 1 / nu apart
+    # Returns nu and Knuth's figure of merit pi^(t/2) nu^t / ((t/2)! m), which should be at least 0.1
+    basis = [[m] + [0] * (dimensions - 1)]
+    for i in range(1, dimensions):
+        basis.append([-pow(a, i, m)] + [1 if j == i else 0 for j in range(1, dimensions)])
+    reduced = lll_reduce(basis)
+    # The shortest vector is a small combination of a reduced basis
+    shortest = None
+    for coefficients in np.ndindex(*[5] * dimensions):
+        vector = [sum((int(k) - 2) * row[i] for k, row in zip(coefficients, reduced)) for i in range(dimensions)]
+        length = sum(x * x for x in vector)
+        if length and (shortest is None or length < shortest):
+            shortest = length
+    nu = math.sqrt(shortest)
+    merit = math.pi**(dimensions / 2) * nu**dimensions / (math.gamma(dimensions / 2 + 1) * m)
+    return nu, merit
+
+
+# --- Report ---
+def run_battery(seed, a, c, m, sample_size=SAMPLE_SIZE, alpha=ALPHA):
+    # Rows of (test, statistic, p-value or None, passed)
+    rows = []
+    conditions, longest = period_conditions(a, c, m)
+    for name, holds in conditions:
+        rows.append((name, "yes" if holds else "no", None, holds))
+    cycle = cycle_length(seed % m, a, c, m)
+    if cycle is None:
+        rows.append((f"Cycle of the seed (over {MAX_CYCLE_STEPS} numbers)", "not found", None, True))
+    else:
+        tail, period = cycle
+        rows.append(("Cycle length of the seed, at least the sample", f"{period} (tail {tail})", None,
+                     period >= sample_size))
+        if longest is not None:
+            rows.append(("Cycle is the longest possible", f"{period} of {longest}", None, period == longest))
+
+    u = LCG(seed, a, c, m).random_block(sample_size)
+    for name, (statistic, p) in [("Frequency chi-square", frequency_test(u)), ("Serial pairs chi-square", serial_test(u)),
+                                 ("Runs up and down (z)", runs_test(u)), ("Gap chi-square", gap_test(u))]:
+        rows.append((name, f"{statistic:.2f}", p, alpha <= p <= 1 - alpha))
+    for dimensions in [2, 3]:
+        nu, merit = spectral_test(a, m, dimensions)
+        rows.append((f"Spectral test {dimensions}-D (merit, nu = {nu:.4g})", f"{merit:.3f}", None, merit >= SPECTRAL_PASS))
+    return rows
+
+
+def format_report(rows):
+    lines = [f"{'Test':<54}{'Statistic':>22}{'p-value':>10}  Result"]
+    for name, statistic, p, passed in rows:
+        lines.append(f"{name:<54}{statistic:>22}{'' if p is None else f'{p:.4f}':>10}  {'PASS' if passed else 'FAIL'}")
+    failed = sum(not passed for *_, passed in rows)
+    lines.append(f"{len(rows) - failed} of {len(rows)} checks passed")
+    return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) < 5:
+        print("Usage: python LCG_Battery.py seed a c m [sample size]")
+        return
+    seed, a, c, m = [int(value) for value in sys.argv[1:5]]
+    sample_size = int(sys.argv[5]) if len(sys.argv) > 5 else SAMPLE_SIZE
+    print(format_report(run_battery(seed, a, c, m, sample_size)))
+
+
+if __name__ == "__main__":
+    main()
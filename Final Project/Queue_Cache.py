@@ -0,0 +1,71 @@
+import json
+import os
+from collections import OrderedDict
+
+
+def normalize_param(value):
+    # 4, 4.0 and "4" are the same query; 12 significant digits absorb the float noise of parsed input
+    return float(f"{float(value):.12g}")
+
+
+class QueueCache:
+    # Bounded LRU cache in front of the calculator models
+    # models maps a model name ("MM1", "MMC", ...) to its function; results are keyed by the model and
+    # its normalized parameters, and callers always get their own copy of the result dict
+    def __init__(self, models, maxsize=4096, path=None):
+        self.models = models
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def key(self, model, params):
+        return (model.upper(), *[normalize_param(value) for value in params])
+
+    def calculate(self, model, *params):
+        key = self.key(model, params)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return dict(self.entries[key])
+
+        self.misses += 1
+        if key[0] not in self.models:
+            raise ValueError(f"Unsupported model: {model}")
+        result = self.models[key[0]](*params)
+        self.entries[key] = dict(result)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Persistence ---
+    def save(self, path=None):
+        # Entries are written least recently used first, so loading them restores the LRU order
+        path = path or self.path
+        if path is None:
+            raise ValueError("No cache file given.")
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump([[list(key), result] for key, result in self.entries.items()], f)
+        os.replace(temp_path, path)
+
+    def load(self, path=None):
+        path = path or self.path
+        with open(path) as f:
+            entries = json.load(f)
+        for key, result in entries[-self.maxsize:]:
+            self.entries[tuple(key)] = result
+            self.entries.move_to_end(tuple(key))
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
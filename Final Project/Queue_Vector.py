@@ -0,0 +1,269 @@
+import numpy as np
+
+
+# Array versions of the calculator models in Queuing_Cal.py
+# Every argument may be a scalar or an array; they are broadcast against each other and every metric
+# comes back as an array of the broadcast shape. Unstable (rho >= 1) or invalid points are NaN
+# instead of an error dict, so a whole staffing grid is evaluated in a few numpy passes.
+METRICS = ["Utilization (rho)", "Lq", "Wq", "W", "L"]
+FINITE_METRICS = ["Blocking Probability", "Effective Lambda"]
+
+
+def erlang_b(offered_load, servers):
+    # Blocking probability of M/M/c/c for arrays of a = lambda / mu and c, from the Erlang B recursion
+    # B(k) = a B(k - 1) / (k + a B(k - 1)), which never overflows; one pass up to the largest c
+    a, c = np.broadcast_arrays(np.asarray(offered_load, dtype=float), np.asarray(servers))
+    shape = a.shape
+    a = a.ravel()
+    c = c.ravel().astype(np.int64)
+
+    max_servers = int(c.max(initial=0))
+    loads, load_idx = np.unique(a, return_inverse=True)
+    if len(loads) * max_servers <= 4 * len(a):
+        # Grids repeat the same loads: run the recursion once per distinct load and look up every c
+        table = np.empty((max_servers + 1, len(loads)))
+        table[0] = 1
+        for k in range(1, max_servers + 1):
+            ab = loads * table[k - 1]
+            table[k] = ab / (k + ab)
+        erlang_b = table[np.maximum(c, 0), load_idx.ravel()]
+    else:
+        # Points are sorted by c so step k only updates the ones that still need it
+        order = np.argsort(c, kind="stable")
+        a_sorted = a[order]
+        c_sorted = c[order]
+        b = np.ones(len(a))
+        for k in range(1, max_servers + 1):
+            lo = np.searchsorted(c_sorted, k, side="left")
+            ab = a_sorted[lo:] * b[lo:]
+            b[lo:] = ab / (k + ab)
+        erlang_b = np.empty(len(a))
+        erlang_b[order] = b
+    return erlang_b.reshape(shape)
+
+
+def erlang_c_from_b(erlang_b, offered_load, servers):
+    # C = B / (1 - rho (1 - B)), so a search over c can carry B along instead of redoing the recursion
+    rho = offered_load / np.maximum(servers, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return erlang_b / (1 - rho * (1 - erlang_b))
+
+
+def erlang_c(offered_load, servers):
+    # Probability that an arrival has to wait in an M/M/c queue, for arrays of a = lambda / mu and c
+    # Equal to the Po * a^c / (c! (1 - rho)) of the scalar models
+    a, c = np.broadcast_arrays(np.asarray(offered_load, dtype=float), np.asarray(servers))
+    return erlang_c_from_b(erlang_b(a, c), a, c)
+
+
+def queue_metrics(lambda_rate, mu_rate, rho, Lq):
+    # Shared tail of every model: Little's law for Wq, W and L, NaN wherever rho >= 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stable = (rho < 1) & (lambda_rate > 0) & (mu_rate > 0)
+        Lq = np.where(stable, Lq, np.nan)
+        Wq = Lq / lambda_rate
+        W = Wq + 1 / mu_rate
+        L = lambda_rate * W
+    return {"Utilization (rho)": rho, "Lq": Lq, "Wq": Wq, "W": W, "L": L}
+
+
+def multi_server_lq(lambda_rate, mu_rate, servers, wait_probability=None):
+    # Lq of the M/M/c queue, NaN for a non-integer or non-positive number of servers
+    # wait_probability is the Erlang C of every point when the caller already has it
+    valid = (servers >= 1) & (servers == np.floor(servers))
+    c = np.where(valid, servers, 1)
+    rho = lambda_rate / (c * mu_rate)
+    if wait_probability is None:
+        wait_probability = erlang_c(lambda_rate / mu_rate, c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Lq = wait_probability * rho / (1 - rho)
+    return np.where(valid, rho, np.nan), Lq
+
+
+def mm1_queue(lambda_rate, mu_rate):
+    lambda_rate, mu_rate = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float),
+                                               np.asarray(mu_rate, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lambda_rate / mu_rate
+        Lq = rho**2 / (1 - rho)
+    return queue_metrics(lambda_rate, mu_rate, rho, Lq)
+
+
+def mmc_queue(lambda_rate, mu_rate, servers, wait_probability=None):
+    lambda_rate, mu_rate, servers = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float),
+                                                        np.asarray(mu_rate, dtype=float),
+                                                        np.asarray(servers, dtype=float))
+    rho, Lq = multi_server_lq(lambda_rate, mu_rate, servers, wait_probability)
+    return queue_metrics(lambda_rate, mu_rate, rho, Lq)
+
+
+def mg1_queue(lambda_rate, mu_rate, sigma_service):
+    lambda_rate, mu_rate, sigma_service = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float),
+                                                              np.asarray(mu_rate, dtype=float),
+                                                              np.asarray(sigma_service, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lambda_rate / mu_rate
+        Lq = (lambda_rate**2 * sigma_service**2 + rho**2) / (2 * (1 - rho))
+    return queue_metrics(lambda_rate, mu_rate, rho, Lq)
+
+
+def mgc_queue(lambda_rate, mu_rate, servers, sigma_service, wait_probability=None):
+    # Lee-Longton, as in the scalar mgc_queue
+    lambda_rate, mu_rate, servers, sigma_service = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float),
+                                                                       np.asarray(mu_rate, dtype=float),
+                                                                       np.asarray(servers, dtype=float),
+                                                                       np.asarray(sigma_service, dtype=float))
+    rho, Lq = multi_server_lq(lambda_rate, mu_rate, servers, wait_probability)
+    cs2 = (sigma_service * mu_rate)**2
+    return queue_metrics(lambda_rate, mu_rate, rho, (1 + cs2) / 2 * Lq)
+
+
+def gg1_queue(lambda_rate, mu_rate, sigma_arrival, sigma_service):
+    lambda_rate, mu_rate, sigma_arrival, sigma_service = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float),
+                                                                             np.asarray(mu_rate, dtype=float),
+                                                                             np.asarray(sigma_arrival, dtype=float),
+                                                                             np.asarray(sigma_service, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lambda_rate / mu_rate
+        ca2 = (sigma_arrival * lambda_rate)**2
+        cs2 = (sigma_service * mu_rate)**2
+        Lq = (rho**2 * (ca2 + cs2)) / (2 * (1 - rho))
+    return queue_metrics(lambda_rate, mu_rate, rho, Lq)
+
+
+def ggc_queue(lambda_rate, mu_rate, servers, sigma_arrival, sigma_service, wait_probability=None):
+    # Allen-Cunneen with the Kraemer-Langenbach-Belz correction, as in the scalar ggc_queue
+    lambda_rate, mu_rate, servers, sigma_arrival, sigma_service = np.broadcast_arrays(
+        np.asarray(lambda_rate, dtype=float), np.asarray(mu_rate, dtype=float), np.asarray(servers, dtype=float),
+        np.asarray(sigma_arrival, dtype=float), np.asarray(sigma_service, dtype=float))
+    rho, Lq = multi_server_lq(lambda_rate, mu_rate, servers, wait_probability)
+    ca2 = (sigma_arrival * lambda_rate)**2
+    cs2 = (sigma_service * mu_rate)**2
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        correction = np.where(ca2 < 1, np.exp(-2 * (1 - rho) * (1 - ca2)**2 / (3 * rho * (ca2 + cs2))),
+                              np.exp(-(1 - rho) * (ca2 - 1) / (ca2 + 4 * cs2)))
+    correction = np.where(ca2 + cs2 == 0, 1.0, correction)
+    return queue_metrics(lambda_rate, mu_rate, rho, correction * (ca2 + cs2) / 2 * Lq)
+
+
+# --- Finite capacity and finite source models ---
+BLOCK_SIZE = 2**22   # states evaluated at once, so wide sweeps of large K or N stay within memory
+
+
+def birth_death_log_weights(arrival_rates, service_rates):
+    # Logs of the unnormalized steady state w(n) of birth-death chains along the last axis: w(0) = 1 and
+    # w(n) = w(n - 1) arrival_rates[n - 1] / service_rates[n - 1], summed as logs so long chains never overflow
+    log_w = np.cumsum(np.log(arrival_rates) - np.log(service_rates), axis=-1)
+    return np.concatenate((np.zeros(log_w.shape[:-1] + (1,)), log_w), axis=-1)
+
+
+def finite_queue(lambda_rate, mu_rate, servers, limit, finite_source):
+    # Birth-death steady state of M/M/c/K (limit = K) or M/M/c//N (limit = N, finite_source) for arrays
+    # The unnormalized probabilities w(n) are products of rates, kept as sums of logs, and every
+    # normalizing sum up to the limit comes from a running logaddexp, so nothing ever overflows.
+    # Points that only differ in K share one chain: its running sums are read off at every K.
+    arrays = np.broadcast_arrays(np.asarray(lambda_rate, dtype=float), np.asarray(mu_rate, dtype=float),
+                                 np.asarray(servers, dtype=float), np.asarray(limit, dtype=float))
+    shape = arrays[0].shape
+    lambda_rate, mu_rate, servers, limit = [array.ravel() for array in arrays]
+    valid = ((lambda_rate > 0) & (mu_rate > 0) & (servers >= 1) & (servers == np.floor(servers))
+             & (limit == np.floor(limit)) & (limit >= (1 if finite_source else servers)))
+    lambda_rate = np.where(valid, lambda_rate, 1)
+    mu_rate = np.where(valid, mu_rate, 1)
+    servers = np.where(valid, servers, 1)
+    limit = np.where(valid, limit, 1).astype(np.int64)
+
+    size = len(lambda_rate)
+    blocking = np.zeros(size)
+    L = np.empty(size)
+    Lq = np.empty(size)
+    keys = [lambda_rate, mu_rate, servers] + ([limit] if finite_source else [])
+    chains, chain_of = np.unique(np.column_stack(keys), axis=0, return_inverse=True)
+    chain_of = chain_of.ravel()
+    order = np.argsort(chain_of, kind="stable")
+    states = np.arange(limit.max(initial=1) + 1)
+    block_size = max(1, BLOCK_SIZE // len(states))
+    for first in range(0, len(chains), block_size):
+        block = chains[first:first + block_size]
+        c = block[:, 2:3]
+        n = states[np.newaxis, 1:]
+        arrivals = block[:, 0:1] * ((block[:, 3:4] - n + 1) if finite_source else 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_w = birth_death_log_weights(arrivals, np.minimum(n, c) * block[:, 1:2])
+            log_total = np.logaddexp.accumulate(log_w, axis=1)
+            log_L = np.logaddexp.accumulate(log_w + np.log(states), axis=1)
+            log_Lq = np.logaddexp.accumulate(log_w + np.log(np.maximum(states - c, 0)), axis=1)
+
+        # Read every point of these chains off at its own limit
+        lo, hi = np.searchsorted(chain_of[order], [first, first + len(block)])
+        points = order[lo:hi]
+        chain = chain_of[points] - first
+        k = limit[points]
+        norm = log_total[chain, k]
+        L[points] = np.exp(log_L[chain, k] - norm)
+        Lq[points] = np.exp(log_Lq[chain, k] - norm)
+        if not finite_source:
+            blocking[points] = np.exp(log_w[chain, k] - norm)
+
+    effective_lambda = lambda_rate * (limit - L) if finite_source else lambda_rate * (1 - blocking)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = {"Utilization (rho)": effective_lambda / (servers * mu_rate), "Blocking Probability": blocking,
+                  "Effective Lambda": effective_lambda, "Lq": Lq, "Wq": Lq / effective_lambda,
+                  "W": L / effective_lambda, "L": L}
+    return {key: np.where(valid, value, np.nan).reshape(shape) for key, value in result.items()}
+
+
+def mmck_queue(lambda_rate, mu_rate, servers, capacity):
+    return finite_queue(lambda_rate, mu_rate, servers, capacity, finite_source=False)
+
+
+def mmcn_queue(lambda_rate, mu_rate, servers, population):
+    return finite_queue(lambda_rate, mu_rate, servers, population, finite_source=True)
+
+
+# --- Parameter sweeps ---
+MODELS = {
+    "MM1": (mm1_queue, ["lambda_rate", "mu_rate"]),
+    "MMC": (mmc_queue, ["lambda_rate", "mu_rate", "servers"]),
+    "MG1": (mg1_queue, ["lambda_rate", "mu_rate", "sigma_service"]),
+    "MGC": (mgc_queue, ["lambda_rate", "mu_rate", "servers", "sigma_service"]),
+    "GG1": (gg1_queue, ["lambda_rate", "mu_rate", "sigma_arrival", "sigma_service"]),
+    "GGC": (ggc_queue, ["lambda_rate", "mu_rate", "servers", "sigma_arrival", "sigma_service"]),
+    "MMCK": (mmck_queue, ["lambda_rate", "mu_rate", "servers", "capacity"]),
+    "MMCN": (mmcn_queue, ["lambda_rate", "mu_rate", "servers", "population"]),
+}
+FINITE_MODELS = ["MMCK", "MMCN"]
+INTEGER_PARAMETERS = ["servers", "capacity", "population"]
+
+
+def model_metrics(model):
+    return METRICS + FINITE_METRICS if model in FINITE_MODELS else METRICS
+
+
+def sweep_values(name, start, stop, steps):
+    # Evenly spaced values of one parameter; counts of servers or customers only take whole values
+    values = np.linspace(start, stop, steps)
+    if name in INTEGER_PARAMETERS:
+        values = np.unique(np.round(values))
+    return values
+
+
+def sweep(model, params, x_name, x_values, y_name, y_values):
+    # Evaluate a model over a two-parameter grid; params holds the fixed values of the other parameters
+    # Every metric comes back as an array of shape (len(y_values), len(x_values))
+    if model not in MODELS:
+        raise ValueError(f"Unsupported model: {model}")
+    function, names = MODELS[model]
+    for name in (x_name, y_name):
+        if name not in names:
+            raise ValueError(f"{model} has no parameter {name}")
+    if x_name == y_name:
+        raise ValueError("Pick two different parameters to sweep.")
+
+    args = dict(params)
+    args[x_name] = np.asarray(x_values, dtype=float)[np.newaxis, :]
+    args[y_name] = np.asarray(y_values, dtype=float)[:, np.newaxis]
+    missing = [name for name in names if name not in args]
+    if missing:
+        raise ValueError("Missing value for " + ", ".join(missing))
+    return function(*[args[name] for name in names])
@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 import math
-from tkinter import PhotoImage
-from PIL import Image, ImageTk  # Import Image and ImageTk modules from PIL
+import numpy as np
+import Queue_Vector
+from Images import load_image
+from Erlang import mmc_lq, erlang_c
+from Queue_Cache import QueueCache
 
 
 # --- Queue Model Functions ---
@@ -23,10 +24,8 @@ def mmc_queue(lambda_rate, mu_rate, servers):
     rho = lambda_rate / (servers * mu_rate)
     if rho >= 1:
         return {"Error": "System is unstable (rho >= 1)."}
-    Po = 1 / (sum([(lambda_rate / mu_rate)**k / math.factorial(k) for k in range(servers)]) +
-              ((lambda_rate / mu_rate)**servers / (math.factorial(servers) * (1 - rho))))
-    Lq = (Po * (lambda_rate / mu_rate)**servers * rho) / \
-        (math.factorial(servers) * (1 - rho)**2)
+    # Erlang C in floats instead of factorials, so thousands of servers do not overflow
+    Lq = mmc_lq(lambda_rate, mu_rate, servers)
     Wq = Lq / lambda_rate
     W = Wq + 1 / mu_rate
     L = lambda_rate * W
@@ -48,10 +47,9 @@ def mgc_queue(lambda_rate, mu_rate, servers, sigma_service):
     rho = lambda_rate / (servers * mu_rate)
     if rho >= 1:
         return {"Error": "System is unstable (rho >= 1)."}
-    Po = 1 / (sum([(lambda_rate / mu_rate)**k / math.factorial(k) for k in range(servers)]) +
-              ((lambda_rate / mu_rate)**servers / (math.factorial(servers) * (1 - rho))))
-    Lq = (Po * (lambda_rate / mu_rate)**servers * rho) / \
-        (math.factorial(servers) * (1 - rho)**2)
+    cs2 = (sigma_service / (1 / mu_rate))**2
+    # Lee-Longton: the M/M/c queue scaled by (1 + cs2) / 2; exact (Pollaczek-Khinchine) for one server
+    Lq = (1 + cs2) / 2 * mmc_lq(lambda_rate, mu_rate, servers)
     Wq = Lq / lambda_rate
     W = Wq + 1 / mu_rate
     L = lambda_rate * W
@@ -71,200 +69,516 @@ def gg1_queue(lambda_rate, mu_rate, sigma_arrival, sigma_service):
     return {"Utilization (rho)": rho, "Lq": Lq, "Wq": Wq, "W": W, "L": L}
 
 
+def klb_correction(rho, ca2, cs2):
+    # Kraemer and Langenbach-Belz factor for Allen-Cunneen; it matters most for smooth arrivals in light traffic
+    if ca2 + cs2 == 0:
+        return 1.0
+    if ca2 < 1:
+        return math.exp(-2 * (1 - rho) * (1 - ca2)**2 / (3 * rho * (ca2 + cs2)))
+    return math.exp(-(1 - rho) * (ca2 - 1) / (ca2 + 4 * cs2))
+
+
 def ggc_queue(lambda_rate, mu_rate, servers, sigma_arrival, sigma_service):
     rho = lambda_rate / (servers * mu_rate)
     if rho >= 1:
         return {"Error": "System is unstable (rho >= 1)."}
     ca2 = (sigma_arrival / (1 / lambda_rate))**2
     cs2 = (sigma_service / (1 / mu_rate))**2
-    Po = 1 / (sum([(lambda_rate / mu_rate)**k / math.factorial(k) for k in range(servers)]) +
-              ((lambda_rate / mu_rate)**servers / (math.factorial(servers) * (1 - rho))))
-    Lq = (Po * (lambda_rate / mu_rate)**servers * rho) / \
-        (math.factorial(servers) * (1 - rho)**2)
+    # Allen-Cunneen: the M/M/c queue scaled by (ca2 + cs2) / 2, with the Kraemer-Langenbach-Belz correction
+    Lq = klb_correction(rho, ca2, cs2) * (ca2 + cs2) / 2 * mmc_lq(lambda_rate, mu_rate, servers)
     Wq = Lq / lambda_rate
     W = Wq + 1 / mu_rate
     L = lambda_rate * W
     return {"Utilization (rho)": rho, "Lq": Lq, "Wq": Wq, "W": W, "L": L}
 
 
-# --- Helper Functions ---
-def calculate_and_plot():
-    try:
-        lambda_rate = float(arrival_rate_entry.get())
-        mu_rate = float(service_rate_entry.get())
-
-        if mu_rate <= 0:
-            raise ValueError("Service rate (mu) must be greater than 0.")
-
-        choice = model_choice.get()
-        if choice == "MM1":
-            result = mm1_queue(lambda_rate, mu_rate)
-        elif choice == "MMC":
-            servers = int(servers_entry.get())
-            result = mmc_queue(lambda_rate, mu_rate, servers)
-        elif choice == "MG1":
-            sigma_service = float(sigma_service_entry.get())
-            result = mg1_queue(lambda_rate, mu_rate, sigma_service)
-        elif choice == "MGC":
-            servers = int(servers_entry.get())
-            sigma_service = float(sigma_service_entry.get())
-            result = mgc_queue(lambda_rate, mu_rate, servers, sigma_service)
-        elif choice == "GG1":
-            sigma_arrival = float(sigma_arrival_entry.get())
-            sigma_service = float(sigma_service_entry.get())
-            result = gg1_queue(lambda_rate, mu_rate,
-                               sigma_arrival, sigma_service)
-        elif choice == "GGC":
-            servers = int(servers_entry.get())
-            sigma_arrival = float(sigma_arrival_entry.get())
-            sigma_service = float(sigma_service_entry.get())
-            result = ggc_queue(lambda_rate, mu_rate, servers,
-                               sigma_arrival, sigma_service)
-        else:
-            raise ValueError("Invalid queuing model selected.")
-
-        if "Error" in result:
-            messagebox.showerror("Error", result["Error"])
+# --- Finite Capacity and Finite Source Models ---
+def birth_death_probabilities(arrival_rates, service_rates):
+    # Steady state of a finite birth-death chain: arrival_rates[n] moves state n to n + 1 and
+    # service_rates[n] moves state n + 1 back to n. The products are summed as logs, as in the
+    # array models, and rescaled by the largest term, so long chains never overflow.
+    log_p = Queue_Vector.birth_death_log_weights(np.asarray(arrival_rates, dtype=float),
+                                                 np.asarray(service_rates, dtype=float))
+    p = np.exp(log_p - log_p.max())
+    return p / p.sum()
+
+
+def finite_metrics(p, servers, mu_rate, blocking, effective_lambda):
+    states = np.arange(len(p))
+    L = float(states @ p)
+    Lq = float(np.maximum(states - servers, 0) @ p)
+    return {"Utilization (rho)": effective_lambda / (servers * mu_rate), "Blocking Probability": blocking,
+            "Effective Lambda": effective_lambda, "Lq": Lq, "Wq": Lq / effective_lambda,
+            "W": L / effective_lambda, "L": L}
+
+
+def mmck_queue(lambda_rate, mu_rate, servers, capacity):
+    # M/M/c/K: at most K customers in the system, arrivals that find it full are turned away
+    # Always stable; rho is the share of time the servers are busy
+    if lambda_rate <= 0 or servers < 1 or capacity < servers:
+        return {"Error": "M/M/c/K needs lambda > 0, c >= 1 and a capacity K of at least c."}
+    p = birth_death_probabilities(np.full(capacity, lambda_rate),
+                                  np.minimum(np.arange(1, capacity + 1), servers) * mu_rate)
+    blocking = float(p[capacity])
+    return finite_metrics(p, servers, mu_rate, blocking, lambda_rate * (1 - blocking))
+
+
+def mmcn_queue(lambda_rate, mu_rate, servers, population):
+    # M/M/c//N (machine repair): N customers, each arriving at rate lambda while outside the system
+    # Nobody is turned away, so the blocking probability is 0
+    if lambda_rate <= 0 or servers < 1 or population < 1:
+        return {"Error": "M/M/c//N needs lambda > 0, c >= 1 and a population N of at least 1."}
+    p = birth_death_probabilities((population - np.arange(population)) * lambda_rate,
+                                  np.minimum(np.arange(1, population + 1), servers) * mu_rate)
+    L = float(np.arange(population + 1) @ p)
+    return finite_metrics(p, servers, mu_rate, 0.0, lambda_rate * (population - L))
+
+
+# Calculator results go through a bounded LRU cache, so repeated queries are served without recomputing
+# Scripts can use CACHE.calculate("MMC", lambda_rate, mu_rate, servers) and CACHE.info() the same way,
+# or build their own QueueCache(MODELS, path=...) to keep results on disk between runs
+MODELS = {"MM1": mm1_queue, "MMC": mmc_queue, "MG1": mg1_queue, "MGC": mgc_queue, "GG1": gg1_queue, "GGC": ggc_queue,
+          "MMCK": mmck_queue, "MMCN": mmcn_queue}
+CACHE = QueueCache(MODELS)
+
+
+# --- Calculator Window ---
+# Sweepable parameters as they are labelled in the input form
+PARAMETER_LABELS = {
+    "lambda_rate": "Arrival Rate (λ)",
+    "mu_rate": "Service Rate (μ)",
+    "servers": "Servers (c)",
+    "sigma_service": "σ Service",
+    "sigma_arrival": "σ Arrival",
+    "capacity": "Capacity (K)",
+    "population": "Population (N)",
+}
+
+
+# Builds the calculator in its own window; pass master to open it inside another Tk application
+def main(master=None):
+    # --- Helper Functions ---
+    def calculate_and_plot():
+        try:
+            lambda_rate = float(arrival_rate_entry.get())
+            mu_rate = float(service_rate_entry.get())
+
+            if mu_rate <= 0:
+                raise ValueError("Service rate (mu) must be greater than 0.")
+
+            choice = model_choice.get()
+            if choice == "MM1":
+                result = CACHE.calculate("MM1", lambda_rate, mu_rate)
+            elif choice == "MMC":
+                servers = int(servers_entry.get())
+                result = CACHE.calculate("MMC", lambda_rate, mu_rate, servers)
+            elif choice == "MG1":
+                sigma_service = float(sigma_service_entry.get())
+                result = CACHE.calculate("MG1", lambda_rate, mu_rate, sigma_service)
+            elif choice == "MGC":
+                servers = int(servers_entry.get())
+                sigma_service = float(sigma_service_entry.get())
+                result = CACHE.calculate("MGC", lambda_rate, mu_rate, servers, sigma_service)
+            elif choice == "GG1":
+                sigma_arrival = float(sigma_arrival_entry.get())
+                sigma_service = float(sigma_service_entry.get())
+                result = CACHE.calculate("GG1", lambda_rate, mu_rate,
+                                         sigma_arrival, sigma_service)
+            elif choice == "GGC":
+                servers = int(servers_entry.get())
+                sigma_arrival = float(sigma_arrival_entry.get())
+                sigma_service = float(sigma_service_entry.get())
+                result = CACHE.calculate("GGC", lambda_rate, mu_rate, servers,
+                                         sigma_arrival, sigma_service)
+            elif choice == "MMCK":
+                servers = int(servers_entry.get())
+                capacity = int(capacity_entry.get())
+                result = CACHE.calculate("MMCK", lambda_rate, mu_rate, servers, capacity)
+            elif choice == "MMCN":
+                servers = int(servers_entry.get())
+                population = int(population_entry.get())
+                result = CACHE.calculate("MMCN", lambda_rate, mu_rate, servers, population)
+            else:
+                raise ValueError("Invalid queuing model selected.")
+
+            info = CACHE.info()
+            cache_label.config(text=f"Cache: {info['hits']} hits, {info['misses']} misses, {info['size']} results")
+            if "Error" in result:
+                messagebox.showerror("Error", result["Error"])
+                return
+
+            update_results(result)
+            plot_graph(result)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def update_results(result):
+        # Blocking and effective arrival rate only exist for the finite models
+        for key, label in result_labels.items():
+            label.config(text=f"{result[key]:.2f}" if key in result else "N/A")
+
+    def plot_graph(result):
+        # Matplotlib is only loaded once the first graph is shown
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        graph_window = tk.Toplevel(root)
+        graph_window.title("Queue Metrics Graph")
+
+        fig, ax = plt.subplots()
+
+        x = ["Utilization (rho)", "Lq", "Wq", "W", "L"]
+        y = [result.get(k, 0) for k in x]
+
+        colors = ["skyblue", "lightgreen", "salmon", "gold", "plum"]
+
+        ax.bar(x, y, color=colors)
+        ax.set_title("Queue Metrics")
+        ax.set_ylabel("Values")
+        ax.set_xlabel("Metrics")
+
+        canvas = FigureCanvasTkAgg(fig, master=graph_window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        tk.Button(graph_window, text="Close",
+                  command=graph_window.destroy).pack(pady=10)
+
+    def open_sweep_window():
+        # Heatmap or contours of one metric over a grid of two parameters of the selected model
+        # The other parameters are taken from the input form
+        import Queue_Vector
+
+        model = model_choice.get()
+        names = Queue_Vector.MODELS[model][1]
+        labels = [PARAMETER_LABELS[name] for name in names]
+
+        sweep_window = tk.Toplevel(root)
+        sweep_window.title(f"Parameter Sweep ({model})")
+
+        form = tk.Frame(sweep_window)
+        form.pack(pady=10)
+        for column, heading in enumerate(["", "Parameter", "From", "To", "Steps"]):
+            tk.Label(form, text=heading).grid(row=0, column=column, padx=5, pady=5)
+
+        axes = []
+        for row, (axis, default) in enumerate([("X axis:", 0), ("Y axis:", 1)], start=1):
+            tk.Label(form, text=axis).grid(row=row, column=0, padx=5, pady=5)
+            choice = ttk.Combobox(form, values=labels, state="readonly")
+            choice.set(labels[default])
+            choice.grid(row=row, column=1, padx=5, pady=5)
+            entries = []
+            for column, value in enumerate(["", "", "50"], start=2):
+                entry = tk.Entry(form, width=10)
+                entry.insert(0, value)
+                entry.grid(row=row, column=column, padx=5, pady=5)
+                entries.append(entry)
+            axes.append((choice, *entries))
+
+        tk.Label(form, text="Metric:").grid(row=3, column=0, padx=5, pady=5)
+        metric_choice = ttk.Combobox(form, values=Queue_Vector.model_metrics(model), state="readonly")
+        metric_choice.set("Wq")
+        metric_choice.grid(row=3, column=1, padx=5, pady=5)
+        tk.Label(form, text="Chart:").grid(row=4, column=0, padx=5, pady=5)
+        kind_choice = ttk.Combobox(form, values=["Heatmap", "Contour"], state="readonly")
+        kind_choice.set("Heatmap")
+        kind_choice.grid(row=4, column=1, padx=5, pady=5)
+
+        def plot_sweep():
+            import Charts
+
+            try:
+                grid = []
+                for choice, start_entry, stop_entry, steps_entry in axes:
+                    name = names[labels.index(choice.get())]
+                    steps = int(steps_entry.get())
+                    if steps < 2:
+                        raise ValueError("Use at least 2 steps per axis.")
+                    values = Queue_Vector.sweep_values(name, float(start_entry.get()), float(stop_entry.get()), steps)
+                    grid.append((name, values))
+                (x_name, x_values), (y_name, y_values) = grid
+
+                params = {}
+                for name in names:
+                    if name not in (x_name, y_name):
+                        value = float(parameter_entries[name].get())
+                        params[name] = int(value) if name in Queue_Vector.INTEGER_PARAMETERS else value
+                result = Queue_Vector.sweep(model, params, x_name, x_values, y_name, y_values)
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=sweep_window)
+                return
+
+            metric = metric_choice.get()
+            fig = Charts.sweep_chart(result[metric], x_values, y_values, metric,
+                                     PARAMETER_LABELS[x_name], PARAMETER_LABELS[y_name], kind_choice.get())
+            graph_window = tk.Toplevel(sweep_window)
+            graph_window.title(f"{metric} Sweep ({model})")
+            canvas = Charts.figure_canvas(fig, graph_window)
+            canvas.draw()
+            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            tk.Button(graph_window, text="Close", command=graph_window.destroy).pack(pady=10)
+
+        tk.Button(sweep_window, text="Plot", command=plot_sweep).pack(pady=10)
+
+    def open_staffing_window():
+        # Smallest number of servers that meets a waiting-time target, for the form's arrival rate
+        # or for a forecast of one arrival rate per interval
+        staffing_window = tk.Toplevel(root)
+        staffing_window.title("Staffing Solver")
+
+        form = tk.Frame(staffing_window)
+        form.pack(pady=10)
+        tk.Label(form, text="Target:").grid(row=0, column=0, padx=5, pady=5)
+        target_choice = ttk.Combobox(form, values=["Max Wq", "Service Level"], state="readonly")
+        target_choice.set("Max Wq")
+        target_choice.grid(row=0, column=1, padx=5, pady=5)
+        tk.Label(form, text="Target Wait (t):").grid(row=1, column=0, padx=5, pady=5)
+        wait_entry = tk.Entry(form)
+        wait_entry.grid(row=1, column=1, padx=5, pady=5)
+        tk.Label(form, text="Service Level (%):").grid(row=2, column=0, padx=5, pady=5)
+        level_entry = tk.Entry(form)
+        level_entry.insert(0, "80")
+        level_entry.grid(row=2, column=1, padx=5, pady=5)
+        tk.Label(form, text="M/G/c and G/G/c service levels use the M/M/c Erlang C approximation").grid(
+            row=3, column=1, padx=5)
+        tk.Label(form, text="Interval Arrival Rates (λ):").grid(row=4, column=0, padx=5, pady=5, sticky="n")
+        forecast_text = tk.Text(form, width=30, height=6)
+        forecast_text.grid(row=4, column=1, padx=5, pady=5)
+        tk.Label(form, text="Leave empty to use the calculator's arrival rate").grid(row=5, column=1, padx=5)
+
+        columns = ("Interval", "λ", "Servers", "Utilization (rho)", "Wq", "Service Level (%)")
+        tree = ttk.Treeview(staffing_window, columns=columns, show="headings", height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110, anchor=tk.CENTER)
+
+        def solve():
+            import Staffing
+
+            try:
+                model = model_choice.get()
+                mu_rate = float(service_rate_entry.get())
+                max_wait = float(wait_entry.get())
+                level = float(level_entry.get()) / 100 if target_choice.get() == "Service Level" else None
+                model_params = {}
+                if model in ("MGC", "GGC"):
+                    model_params["sigma_service"] = float(sigma_service_entry.get())
+                if model == "GGC":
+                    model_params["sigma_arrival"] = float(sigma_arrival_entry.get())
+                if model == "MMCK":
+                    model_params["capacity"] = int(capacity_entry.get())
+                if model == "MMCN":
+                    model_params["population"] = int(population_entry.get())
+
+                forecast = forecast_text.get("1.0", tk.END).replace(",", " ").split()
+                if forecast:
+                    rates = [float(value) for value in forecast]
+                    result = Staffing.min_servers_forecast(rates, mu_rate, max_wait, level, model, **model_params)
+                    rows = [[result.get(key, [None] * len(rates))[i]
+                             for key in ("Servers", "Utilization (rho)", "Wq", "Service Level")]
+                            for i in range(len(rates))]
+                else:
+                    rates = [float(arrival_rate_entry.get())]
+                    result = Staffing.min_servers(rates[0], mu_rate, max_wait, level, model, **model_params)
+                    rows = [[result.get(key) for key in ("Servers", "Utilization (rho)", "Wq", "Service Level")]]
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=staffing_window)
+                return
+
+            tree.delete(*tree.get_children())
+            for i, (rate, (servers, rho, wq, service_level)) in enumerate(zip(rates, rows), start=1):
+                # The finite models have no service level
+                tree.insert("", "end", values=(i, f"{rate:.2f}", int(servers), f"{rho:.2f}", f"{wq:.4f}",
+                                               "-" if service_level is None else f"{service_level * 100:.2f}"))
+
+        tk.Button(staffing_window, text="Solve", command=solve).pack(pady=10)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def open_transient_window():
+        # L(t), Lq(t) and P(wait) over time for M/M/1, M/M/c or M/M/c/K from the form, starting with a
+        # given number of customers (0 for an empty system at opening time)
+        model = model_choice.get()
+        if model not in ("MM1", "MMC", "MMCK"):
+            messagebox.showerror("Error", "Transient analysis needs a Markovian model (MM1, MMC or MMCK).")
             return
 
-        update_results(result)
-        plot_graph(result)
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-
-
-def update_results(result):
-    for key, value in result.items():
-        result_labels[key].config(text=f"{value:.2f}")
-
-
-def plot_graph(result):
-    graph_window = tk.Toplevel(root)
-    graph_window.title("Queue Metrics Graph")
-
-    fig, ax = plt.subplots()
-
-    x = ["Utilization (rho)", "Lq", "Wq", "W", "L"]
-    y = [result.get(k, 0) for k in x]
-
-    colors = ["skyblue", "lightgreen", "salmon", "gold", "plum"]
-
-    ax.bar(x, y, color=colors)
-    ax.set_title("Queue Metrics")
-    ax.set_ylabel("Values")
-    ax.set_xlabel("Metrics")
-
-    canvas = FigureCanvasTkAgg(fig, master=graph_window)
-    canvas.draw()
-    canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-    tk.Button(graph_window, text="Close",
-              command=graph_window.destroy).pack(pady=10)
-
-
-# --- Main Application ---
-
-def on_closing(event=None):
-    root.destroy()
-
-
-root = tk.Tk()
-root.bind('<Escape>', on_closing)
-root.title("Queuing Calculator")
-root.protocol("WM_DELETE_WINDOW", on_closing)
-# Get the screen width and height
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-
-# Maximize the window
-root.state("zoomed")
-    
-top_box_height = 60
-
-# Set the window to full screen
-root.geometry(f"{screen_width}x{screen_height}+0+0")
-
-# Create a canvas widget to draw the box
-canvas = tk.Canvas(root, width=screen_width, height=top_box_height, bg="lightgray")
-canvas.pack(fill=tk.X)
-
-# Create a rectangle on the canvas
-canvas.create_rectangle(
-    0, 0,  # Top-left corner of the rectangle
-    screen_width, top_box_height,  # Bottom-right corner of the rectangle
-    fill="#008080", outline="#008080"  # Dark sea green color
-)
-
-# Add a logo to the box (optional, similar to previous code)
-try:
-    # Open the logo image file
-    logo_image = Image.open("logo.png")  # Use the correct file path
-    
-    # Resize the image (make it smaller)
-    logo_image = logo_image.resize((150, 100))  # Resize to 50x50 (adjust as needed)
-    
-    # Convert the image to a PhotoImage object for Tkinter
-    logo_image_tk = ImageTk.PhotoImage(logo_image)
-    
-    # Place the resized logo on the canvas
-    canvas.create_image(10, 30, image=logo_image_tk, anchor="w")  # Positioned in the left center
-except Exception as e:
-    canvas.create_text(10, top_box_height // 2, text="Logo Not Available", anchor="w", font=("Arial", 12, "bold"))
-
-# Add title text next to the logo (aligned horizontally)
-canvas.create_text(630, top_box_height // 2, text="Queuing Calculator", font=("Arial", 22, "bold"), anchor="w", fill='white')
-
-
-# Input Frame
-input_frame = tk.Frame(root)
-input_frame.pack(pady=10)
-
-tk.Label(input_frame, text="Arrival Rate (λ):").grid(
-    row=0, column=0, padx=5, pady=5)
-arrival_rate_entry = tk.Entry(input_frame)
-arrival_rate_entry.grid(row=0, column=1, padx=5, pady=5)
-
-tk.Label(input_frame, text="Service Rate (μ):").grid(
-    row=1, column=0, padx=5, pady=5)
-service_rate_entry = tk.Entry(input_frame)
-service_rate_entry.grid(row=1, column=1, padx=5, pady=5)
+        transient_window = tk.Toplevel(root)
+        transient_window.title(f"Transient Analysis ({model})")
+
+        form = tk.Frame(transient_window)
+        form.pack(pady=10)
+        fields = {}
+        for row, (label, default) in enumerate([("Time Horizon:", ""), ("Time Points:", "200"),
+                                                ("Customers at Time 0:", "0")]):
+            tk.Label(form, text=label).grid(row=row, column=0, padx=5, pady=5)
+            entry = tk.Entry(form)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, padx=5, pady=5)
+            fields[label] = entry
+
+        def plot_transient():
+            import numpy as np
+            import Charts
+            from Transient import transient_queue
+
+            try:
+                lambda_rate = float(arrival_rate_entry.get())
+                mu_rate = float(service_rate_entry.get())
+                servers = 1 if model == "MM1" else int(servers_entry.get())
+                capacity = int(capacity_entry.get()) if model == "MMCK" else None
+                horizon = float(fields["Time Horizon:"].get())
+                points = int(fields["Time Points:"].get())
+                if horizon <= 0 or points < 2:
+                    raise ValueError("Use a time horizon greater than 0 and at least 2 time points.")
+                result = transient_queue(lambda_rate, mu_rate, servers, np.linspace(0, horizon, points),
+                                         capacity, int(fields["Customers at Time 0:"].get()))
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=transient_window)
+                return
+
+            # Steady state of the same queue for reference, when there is one
+            if model == "MMCK":
+                steady = CACHE.calculate("MMCK", lambda_rate, mu_rate, servers, capacity)
+            elif lambda_rate < servers * mu_rate:
+                steady = CACHE.calculate("MMC", lambda_rate, mu_rate, servers)
+                steady["P(wait)"] = erlang_c(lambda_rate / mu_rate, servers)
+            else:
+                steady = None
+            fig = Charts.transient_chart(result, steady, f"Transient {model}")
+            graph_window = tk.Toplevel(transient_window)
+            graph_window.title(f"Transient Analysis ({model})")
+            canvas = Charts.figure_canvas(fig, graph_window)
+            canvas.draw()
+            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            tk.Label(graph_window, text=f"Error bound: {result['Error Bound']:.1e}").pack()
+            tk.Button(graph_window, text="Close", command=graph_window.destroy).pack(pady=10)
+
+        tk.Button(transient_window, text="Plot", command=plot_transient).pack(pady=10)
+
+    # --- Main Application ---
+    def on_closing(event=None):
+        root.destroy()
+
+    root = tk.Tk() if master is None else tk.Toplevel(master)
+    root.bind('<Escape>', on_closing)
+    root.title("Queuing Calculator")
+    root.protocol("WM_DELETE_WINDOW", on_closing)
+    # Get the screen width and height
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+
+    # Maximize the window
+    root.state("zoomed")
+
+    top_box_height = 60
+
+    # Set the window to full screen
+    root.geometry(f"{screen_width}x{screen_height}+0+0")
+
+    # Create a canvas widget to draw the box
+    canvas = tk.Canvas(root, width=screen_width, height=top_box_height, bg="lightgray")
+    canvas.pack(fill=tk.X)
+
+    # Create a rectangle on the canvas
+    canvas.create_rectangle(
+        0, 0,  # Top-left corner of the rectangle
+        screen_width, top_box_height,  # Bottom-right corner of the rectangle
+        fill="#008080", outline="#008080"  # Dark sea green color
+    )
+
+    # Add a logo to the box (optional, similar to previous code)
+    try:
+        # Open, resize and convert the logo once per process
+        logo_image_tk = load_image("logo.png", (150, 100))
 
-model_choice = ttk.Combobox(input_frame, values=[
-                            "MM1", "MMC", "MG1", "MGC", "GG1", "GGC"], state="readonly")
-model_choice.grid(row=2, column=1, padx=5, pady=5)
-model_choice.set("MM1")
-tk.Label(input_frame, text="Model:").grid(row=2, column=0, padx=5, pady=5)
-
-# Additional inputs
-servers_label = tk.Label(input_frame, text="Servers (c):")
-servers_label.grid(row=3, column=0, padx=5, pady=5)
-servers_entry = tk.Entry(input_frame)
-servers_entry.grid(row=3, column=1, padx=5, pady=5)
-
-sigma_service_label = tk.Label(input_frame, text="σ Service:")
-sigma_service_label.grid(row=4, column=0, padx=5, pady=5)
-sigma_service_entry = tk.Entry(input_frame)
-sigma_service_entry.grid(row=4, column=1, padx=5, pady=5)
-
-sigma_arrival_label = tk.Label(input_frame, text="σ Arrival:")
-sigma_arrival_label.grid(row=5, column=0, padx=5, pady=5)
-sigma_arrival_entry = tk.Entry(input_frame)
-sigma_arrival_entry.grid(row=5, column=1, padx=5, pady=5)
-
-# Results Frame
-results_frame = tk.Frame(root)
-results_frame.pack(pady=10)
-
-result_labels = {}
-metrics = ["Utilization (rho)", "Lq", "Wq", "W", "L"]
-for i, metric in enumerate(metrics):
-    tk.Label(results_frame, text=f"{metric}:").grid(
-        row=i, column=0, padx=5, pady=5)
-    result_labels[metric] = tk.Label(results_frame, text="N/A")
-    result_labels[metric].grid(row=i, column=1, padx=5, pady=5)
-
-# Calculate Button
-tk.Button(root, text="Calculate", command=calculate_and_plot).pack(pady=10)
-
-
-root.mainloop()
+        # Place the resized logo on the canvas
+        canvas.create_image(10, 30, image=logo_image_tk, anchor="w")  # Positioned in the left center
+    except Exception as e:
+        canvas.create_text(10, top_box_height // 2, text="Logo Not Available", anchor="w", font=("Arial", 12, "bold"))
+
+    # Add title text next to the logo (aligned horizontally)
+    canvas.create_text(630, top_box_height // 2, text="Queuing Calculator", font=("Arial", 22, "bold"), anchor="w", fill='white')
+
+    # Input Frame
+    input_frame = tk.Frame(root)
+    input_frame.pack(pady=10)
+
+    tk.Label(input_frame, text="Arrival Rate (λ):").grid(
+        row=0, column=0, padx=5, pady=5)
+    arrival_rate_entry = tk.Entry(input_frame)
+    arrival_rate_entry.grid(row=0, column=1, padx=5, pady=5)
+
+    tk.Label(input_frame, text="Service Rate (μ):").grid(
+        row=1, column=0, padx=5, pady=5)
+    service_rate_entry = tk.Entry(input_frame)
+    service_rate_entry.grid(row=1, column=1, padx=5, pady=5)
+
+    model_choice = ttk.Combobox(input_frame, values=[
+                                "MM1", "MMC", "MG1", "MGC", "GG1", "GGC", "MMCK", "MMCN"], state="readonly")
+    model_choice.grid(row=2, column=1, padx=5, pady=5)
+    model_choice.set("MM1")
+    tk.Label(input_frame, text="Model:").grid(row=2, column=0, padx=5, pady=5)
+
+    # Additional inputs
+    servers_label = tk.Label(input_frame, text="Servers (c):")
+    servers_label.grid(row=3, column=0, padx=5, pady=5)
+    servers_entry = tk.Entry(input_frame)
+    servers_entry.grid(row=3, column=1, padx=5, pady=5)
+
+    sigma_service_label = tk.Label(input_frame, text="σ Service:")
+    sigma_service_label.grid(row=4, column=0, padx=5, pady=5)
+    sigma_service_entry = tk.Entry(input_frame)
+    sigma_service_entry.grid(row=4, column=1, padx=5, pady=5)
+
+    sigma_arrival_label = tk.Label(input_frame, text="σ Arrival:")
+    sigma_arrival_label.grid(row=5, column=0, padx=5, pady=5)
+    sigma_arrival_entry = tk.Entry(input_frame)
+    sigma_arrival_entry.grid(row=5, column=1, padx=5, pady=5)
+
+    capacity_label = tk.Label(input_frame, text="Capacity (K):")
+    capacity_label.grid(row=6, column=0, padx=5, pady=5)
+    capacity_entry = tk.Entry(input_frame)
+    capacity_entry.grid(row=6, column=1, padx=5, pady=5)
+
+    population_label = tk.Label(input_frame, text="Population (N):")
+    population_label.grid(row=7, column=0, padx=5, pady=5)
+    population_entry = tk.Entry(input_frame)
+    population_entry.grid(row=7, column=1, padx=5, pady=5)
+
+    # Results Frame
+    results_frame = tk.Frame(root)
+    results_frame.pack(pady=10)
+
+    result_labels = {}
+    metrics = ["Utilization (rho)", "Lq", "Wq", "W", "L", "Blocking Probability", "Effective Lambda"]
+    for i, metric in enumerate(metrics):
+        tk.Label(results_frame, text=f"{metric}:").grid(
+            row=i, column=0, padx=5, pady=5)
+        result_labels[metric] = tk.Label(results_frame, text="N/A")
+        result_labels[metric].grid(row=i, column=1, padx=5, pady=5)
+    cache_label = tk.Label(results_frame, text="")
+    cache_label.grid(row=len(metrics), column=0, columnspan=2, padx=5, pady=5)
+
+    # Form fields the parameter sweep reads its fixed values from
+    parameter_entries = {
+        "lambda_rate": arrival_rate_entry,
+        "mu_rate": service_rate_entry,
+        "servers": servers_entry,
+        "sigma_service": sigma_service_entry,
+        "sigma_arrival": sigma_arrival_entry,
+        "capacity": capacity_entry,
+        "population": population_entry,
+    }
+
+    # Calculate Button
+    tk.Button(root, text="Calculate", command=calculate_and_plot).pack(pady=10)
+    tk.Button(root, text="Parameter Sweep", command=open_sweep_window).pack(pady=10)
+    tk.Button(root, text="Staffing Solver", command=open_staffing_window).pack(pady=10)
+    tk.Button(root, text="Transient Analysis", command=open_transient_window).pack(pady=10)
+
+    if master is None:
+        root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
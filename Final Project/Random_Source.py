@@ -0,0 +1,188 @@
+import math
+import numpy as np
+from LCG import LCG, MRG32k3a
+
+
+# Random sources for the simulation engine
+# Engine only calls random, exponential, normal, uniform, gamma, lognormal, weibull and integers with
+# numpy's signatures, so an np.random.Generator works as is, and LCGSource gives the same methods on top
+# of the project's LCG or MRG32k3a. Every draw is served from a buffer of uniforms that is refilled a
+# large block at a time.
+SOURCES = ["NumPy", "LCG", "MRG32k3a"]
+DEFAULT_LCG = (1103515245, 12345, 2**31)   # a, c and m of the ANSI C rand()
+BLOCK_SIZE = 2**20
+
+
+class BufferedSource:
+    # numpy-style draws built from uniforms on [0, 1); subclasses supply fill(n), the next n uniforms
+    # The stream of uniforms is the same whatever the block size, so runs only depend on the generator
+    def __init__(self, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self.buffer = np.empty(0)
+        self.position = 0
+
+    def fill(self, n):
+        raise NotImplementedError
+
+    def uniforms(self, n):
+        parts = []
+        while n > 0:
+            if self.position == len(self.buffer):
+                self.buffer = self.fill(max(self.block_size, n))
+                self.position = 0
+            take = min(n, len(self.buffer) - self.position)
+            parts.append(self.buffer[self.position:self.position + take])
+            self.position += take
+            n -= take
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def draw(self, size, sample):
+        # sample(n) gives n draws; a size of None gives a single float, like numpy
+        if size is None:
+            return float(sample(1)[0])
+        shape = (size,) if np.ndim(size) == 0 else tuple(size)
+        return sample(math.prod(shape)).reshape(shape)
+
+    # --- numpy Generator methods used by Engine ---
+    def random(self, size=None):
+        return self.draw(size, self.uniforms)
+
+    def exponential(self, scale=1.0, size=None):
+        # Inversion; 1 - u is in (0, 1], so the log is always finite
+        return self.draw(size, lambda n: -np.log1p(-self.uniforms(n)) * scale)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return self.draw(size, lambda n: loc + scale * self.standard_normal(n))
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return self.draw(size, lambda n: low + (high - low) * self.uniforms(n))
+
+    def gamma(self, shape, scale=1.0, size=None):
+        return self.draw(size, lambda n: self.standard_gamma(shape, n) * scale)
+
+    def lognormal(self, mean=0.0, sigma=1.0, size=None):
+        return self.draw(size, lambda n: np.exp(mean + sigma * self.standard_normal(n)))
+
+    def weibull(self, a, size=None):
+        # Inversion of the standard Weibull, scale 1 as in numpy
+        return self.draw(size, lambda n: (-np.log1p(-self.uniforms(n))) ** (1 / a))
+
+    def integers(self, low, high=None, size=None):
+        # Uniform integers in [low, high); low and high may be arrays, as in numpy
+        if high is None:
+            low, high = 0, low
+        if size is None:
+            size = np.broadcast(np.asarray(low), np.asarray(high)).shape
+        u = self.draw(size, self.uniforms)
+        return (low + np.floor(u * (np.asarray(high) - low))).astype(np.int64)
+
+    # --- Transformations ---
+    def standard_normal(self, n):
+        # Box-Muller: every pair of uniforms gives two normals
+        pairs = (n + 1) // 2
+        u = self.uniforms(2 * pairs)
+        radius = np.sqrt(-2 * np.log1p(-u[:pairs]))
+        angle = 2 * np.pi * u[pairs:]
+        return np.concatenate((radius * np.cos(angle), radius * np.sin(angle)))[:n]
+
+    def standard_gamma(self, shape, n):
+        # Marsaglia-Tsang squeeze, run on whole arrays: every round proposes for all the draws still missing
+        if shape <= 0:
+            raise ValueError("The gamma shape must be greater than 0.")
+        if shape < 1:
+            # Gamma(k) = Gamma(k + 1) U^(1 / k)
+            return self.standard_gamma(shape + 1, n) * self.uniforms(n) ** (1 / shape)
+        d = shape - 1 / 3
+        c = 1 / math.sqrt(9 * d)
+        parts = []
+        missing = n
+        while missing > 0:
+            # The acceptance rate is at least 95%, so a few extra proposals usually finish in one round
+            proposals = missing + missing // 16 + 16
+            z = self.standard_normal(proposals)
+            u = self.uniforms(proposals)
+            v = (1 + c * z) ** 3
+            with np.errstate(invalid="ignore", divide="ignore"):
+                accepted = (v > 0) & (np.log1p(-u) < 0.5 * z**2 + d - d * v + d * np.log(v))
+            parts.append((d * v[accepted])[:missing])
+            missing -= len(parts[-1])
+        return np.concatenate(parts) if parts else np.empty(0)
+
+
+class LCGSource(BufferedSource):
+    # Uniforms of the LCG (seed / m, in exactly the order LCG.next() produces them) or of MRG32k3a
+    def __init__(self, lcg, block_size=BLOCK_SIZE):
+        super().__init__(block_size)
+        self.lcg = lcg
+
+    def fill(self, n):
+        return self.lcg.random_block(n)
+
+
+def check_lcg(seed, a, c, m):
+    # ValueError for LCG constants the generator cannot use: m must be at least 1, a and c in [0, m) and the
+    # seed at least 0, and the first number must not be a fixed point of x -> (a x + c) mod m, or every
+    # draw is the same (m = 1, a = 0, or c = 0 from a seed of 0)
+    if m <= 0:
+        raise ValueError("The LCG modulus m must be greater than 0.")
+    if not (0 <= a < m and 0 <= c < m):
+        raise ValueError(f"The LCG constants a and c must be between 0 and m - 1 = {m - 1}.")
+    if seed < 0:
+        raise ValueError("The seed must be at least 0.")
+    first = (a * seed + c) % m
+    if (a * first + c) % m == first:
+        raise ValueError("These LCG constants and seed give the same number on every draw.")
+
+
+def make_source(name="NumPy", seed=None, a=None, c=None, m=None, stream=None):
+    # Random source for Engine: "NumPy" is numpy's default generator, "LCG" the project's LCG with the
+    # given a, c and m (the ANSI C constants when left out) and "MRG32k3a" the combined generator;
+    # without a seed they all start from fresh entropy
+    # stream i gives replication or worker i its own independent source for the same seed: the i-th
+    # spawned seed of NumPy or the i-th stream of MRG32k3a. Streams only line up when the seed is given.
+    if stream is not None and name == "LCG":
+        raise ValueError("Streams are only available for the NumPy and MRG32k3a sources.")
+    if name == "NumPy":
+        if stream is not None:
+            return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream,)))
+        return np.random.default_rng(seed)
+    if name == "MRG32k3a":
+        generator = MRG32k3a(np.random.SeedSequence().entropy if seed is None else seed)
+        return LCGSource(generator.stream(stream) if stream else generator)
+    if name == "LCG":
+        default_a, default_c, default_m = DEFAULT_LCG
+        a = default_a if a is None else a
+        c = default_c if c is None else c
+        m = default_m if m is None else m
+        if seed is None and m > 0:
+            seed = np.random.SeedSequence().entropy % m
+        check_lcg(seed, a, c, m)
+        return LCGSource(LCG(seed, a, c, m))
+    raise ValueError(f"Unsupported random source: {name}")
+
+
+def add_source_inputs(frame, row):
+    # Random source, seed and LCG constants on one row of a simulator's input grid
+    # Returns a function that builds the chosen source from the fields; empty fields take the defaults
+    import tkinter as tk
+    from tkinter import ttk
+
+    tk.Label(frame, text="Random Source:").grid(row=row, column=0, padx=5, pady=5)
+    source_choice = ttk.Combobox(frame, values=SOURCES, state="readonly")
+    source_choice.set("NumPy")
+    source_choice.grid(row=row, column=1, padx=5, pady=5)
+    tk.Label(frame, text="Seed:").grid(row=row, column=2, padx=5, pady=5)
+    seed_entry = tk.Entry(frame)
+    seed_entry.grid(row=row, column=3, padx=5, pady=5)
+    tk.Label(frame, text="LCG a c m:").grid(row=row, column=4, padx=5, pady=5)
+    lcg_entry = tk.Entry(frame)
+    lcg_entry.grid(row=row, column=5, padx=5, pady=5)
+
+    def make():
+        seed = int(seed_entry.get()) if seed_entry.get().strip() else None
+        constants = [int(value) for value in lcg_entry.get().split()]
+        if constants and len(constants) != 3:
+            raise ValueError("Enter the LCG constants as three whole numbers: a c m.")
+        return make_source(source_choice.get(), seed, *constants)
+
+    return make
@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import Engine
+from Random_Source import make_source
+from Stats import t_quantile
+
+
+MODELS = {"MMC": Engine.run_mmc, "MGC": Engine.run_mgc, "GGC": Engine.run_ggc}
+METRICS = ["Waiting Time", "Turnaround Time", "Response Time", "Utilization (%)"]
+
+
+def replication_metrics(result):
+    # Summarize one sample path the same way the simulator windows do
+    total_time = result["finish_times"].max()
+    utilizations = result["server_busy_time"] / total_time * 100
+    return [
+        result["waiting_times"].mean(),
+        result["turnaround_times"].mean(),
+        result["response_times"].mean(),
+        utilizations.mean(),
+    ]
+
+
+def run_replication(model, params, rng, engine="direct"):
+    # Every replication draws from its own stream so the results do not depend on scheduling
+    return replication_metrics(MODELS[model](*params, engine=engine, rng=rng))
+
+
+def run_replications(model, params, replications, seed=None, workers=None, confidence=0.95, engine="direct",
+                     source="NumPy"):
+    # Run independent replications of MMC, MGC or GGC and aggregate them into confidence intervals
+    # params are the positional arguments of Engine.run_mmc / run_mgc / run_ggc
+    # source is "NumPy" or "MRG32k3a"; replication i takes stream i of the source
+    # The same seed always reproduces the same replications, whatever the number of workers
+    if model not in MODELS:
+        raise ValueError(f"Unsupported model: {model}")
+    if replications < 2:
+        raise ValueError("At least 2 replications are needed for a confidence interval.")
+
+    # Without a seed the streams still have to share one, so fresh entropy is drawn once
+    seed = np.random.SeedSequence(seed).entropy
+    rngs = [make_source(source, seed, stream=i) for i in range(replications)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        samples = [run_replication(model, params, rng, engine) for rng in rngs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            samples = list(pool.map(run_replication, [model] * replications, [params] * replications,
+                                    rngs, [engine] * replications))
+    samples = np.array(samples)
+
+    t = t_quantile(confidence, replications - 1)
+    means = samples.mean(axis=0)
+    std_errors = samples.std(axis=0, ddof=1) / np.sqrt(replications)
+    summary = {}
+    for i, metric in enumerate(METRICS):
+        summary[metric] = {
+            "Mean": float(means[i]),
+            "Std Error": float(std_errors[i]),
+            "CI Low": float(means[i] - t * std_errors[i]),
+            "CI High": float(means[i] + t * std_errors[i]),
+        }
+    return summary
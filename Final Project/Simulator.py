@@ -1,21 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk  # For handling images
-import subprocess
+from Images import load_image
+
+# The calculator and simulators open as windows of this application instead of new interpreters
+# Each module is imported on first use only and then reused by later clicks
+# Engine.DISTRIBUTIONS, repeated here so the menu does not import the engine before it is needed
+GENERAL_DISTRIBUTIONS = ["Normal", "Uniform", "Gamma", "Lognormal", "Weibull"]
 
 # Function to open the queuing calculator
 
 
-def open_queuing_calculator():
+def open_queuing_calculator(root):
     try:
-        subprocess.Popen(["python", "Queuing_Cal.py"])
-    except FileNotFoundError:
-        messagebox.showerror("Error", "Queuing_Cal.py file not found.")
+        import Queuing_Cal
+        Queuing_Cal.main(root)
+    except ImportError as e:
+        messagebox.showerror("Error", f"Could not open the queuing calculator: {e}")
 
 # Function to handle the simulator
 
 
-def open_simulator():
+def open_simulator(root):
     def run_simulation():
         arrival_dist = arrival_choice.get()
         service_dist = service_choice.get()
@@ -27,20 +32,23 @@ def open_simulator():
 
         try:
             if arrival_dist == "Poisson" and service_dist == "Exponential":
-                subprocess.Popen(["python", "MMC.py"])
-            elif arrival_dist in ["Poisson", "Exponential"] and service_dist in ["Normal", "Uniform", "Gamma"]:
-                subprocess.Popen(["python", "MGC.py"])
-            elif arrival_dist in ["Normal", "Uniform", "Gamma"] and service_dist in ["Normal", "Uniform", "Gamma"]:
-                subprocess.Popen(["python", "GGC.py"])
-            elif arrival_dist == service_dist in ["Normal", "Uniform", "Gamma"] and service_dist == "Exponential":
+                import MMC
+                MMC.main(root)
+            elif arrival_dist in ["Poisson", "Exponential"] and service_dist in GENERAL_DISTRIBUTIONS:
+                import MGC
+                MGC.main(root)
+            elif arrival_dist in GENERAL_DISTRIBUTIONS and service_dist in GENERAL_DISTRIBUTIONS:
+                import GGC
+                GGC.main(root)
+            elif arrival_dist == service_dist in GENERAL_DISTRIBUTIONS and service_dist == "Exponential":
                 messagebox.showerror(
                     "Error", "Invalid combination of distributions.")
             else:
                 messagebox.showerror(
                     "Error", "Invalid combination of distributions.")
-        except FileNotFoundError as e:
+        except ImportError as e:
             messagebox.showerror(
-                "Error", f"{str(e).split(' ')[-1]} file not found.")
+                "Error", f"Could not open the simulator: {e}")
 
     # Create a new window for distribution selection
     sim_window = tk.Toplevel(root)
@@ -62,14 +70,8 @@ def open_simulator():
         fill="#008080", outline="#008080"  # Use a darker sea green color
     )
 
-    # Add the logo to the top-left corner
-    logo_image = Image.open("logo.png")  # Replace with your logo image path
-    logo_image = logo_image.resize(
-        (150, 100), Image.Resampling.LANCZOS)  # Resize logo as needed
-    logo_photo = ImageTk.PhotoImage(logo_image)
-
-    # Retain the reference by storing it as an attribute of the sim_window
-    sim_window.logo_photo = logo_photo  # Keep a reference
+    # Add the logo to the top-left corner (loaded once and cached)
+    logo_photo = load_image("logo.png", (150, 100))
 
     # Place the logo image on the canvas
     canvas.create_image(10, -20, image=logo_photo, anchor="nw")
@@ -82,11 +84,11 @@ def open_simulator():
     arrival_label = tk.Label(
         sim_window, text="Select Arrival Time Distribution:")
     arrival_choice = ttk.Combobox(sim_window, values=[
-                                  "Poisson", "Exponential", "Normal", "Uniform", "Gamma"], state="readonly")
+                                  "Poisson", "Exponential"] + GENERAL_DISTRIBUTIONS, state="readonly")
     service_label = tk.Label(
         sim_window, text="Select Service Time Distribution:")
     service_choice = ttk.Combobox(sim_window, values=[
-                                  "Poisson", "Exponential", "Normal", "Uniform", "Gamma"], state="readonly")
+                                  "Poisson", "Exponential"] + GENERAL_DISTRIBUTIONS, state="readonly")
     run_button = tk.Button(
         sim_window, text="Run Simulator", command=run_simulation)
 
@@ -98,88 +100,81 @@ def open_simulator():
     canvas.create_window(screen_width // 2, 400, window=run_button)
 
 
-# Main Application Window
-root = tk.Tk()
-root.title("Queueing and Simulation System")
-
-# Get the screen width and height
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-
-# Maximize the window
-root.state("zoomed")
-root.geometry(f"{screen_width}x{screen_height}+0+0")
-
-canvas = tk.Canvas(root, width=screen_width, height=screen_height)
-canvas.pack(fill="both", expand=True)
-
-# Create a light gray box spanning the top from left to right
-top_box_height = 110  # Adjust the height as needed
-canvas.create_rectangle(
-    0, 0,  # Top-left corner of the rectangle
-    screen_width, top_box_height,  # Bottom-right corner of the rectangle
-    fill="#008080", outline="#008080"  # Use a darker sea green color
-)
-
-# Add the logo to the top-left corner
-logo_image = Image.open("logo.png")  # Replace with your logo image path
-logo_image = logo_image.resize(
-    (270, 160), Image.Resampling.LANCZOS)  # Resize logo as needed
-logo_photo = ImageTk.PhotoImage(logo_image)
-
-canvas.create_image(-1, -25, image=logo_photo, anchor="nw")
-
-# Title Label
-text_id = canvas.create_text(
-    screen_width // 2, 55, text="Queuing and Simulation System", font=("Tahoma", 36, "bold"), fill="white")
-
-# Buttons for options
-button_exit = tk.Button(
-    root, text="Exit", command=root.destroy, font=("Arial", 12))
-
-# Load and resize images to be square
-image1 = Image.open("calculator.png")  # Replace with your image paths
-image2 = Image.open("simulator.png")
-image3 = Image.open("exit.png")
-image_size = 200  # Size for the square images
-
-image1 = image1.resize((image_size, image_size), Image.Resampling.LANCZOS)
-image2 = image2.resize((image_size, image_size), Image.Resampling.LANCZOS)
-image3 = image3.resize((image_size, image_size), Image.Resampling.LANCZOS)
-
-# Convert images to PhotoImage objects
-image1_photo = ImageTk.PhotoImage(image1)
-image2_photo = ImageTk.PhotoImage(image2)
-image3_photo = ImageTk.PhotoImage(image3)
-
-# Place images side by side
-canvas.create_image(screen_width // 4, 350, image=image1_photo)
-canvas.create_image(screen_width // 2, 350, image=image2_photo)
-canvas.create_image(3 * screen_width // 4, 350, image=image3_photo)
-
-# Place buttons below each image
-button1 = tk.Button(root, text="Queuing Calculator",
-                    command=open_queuing_calculator, font=("Arial", 14), width=20)
-button2 = tk.Button(root, text="Simulator",
-                    command=open_simulator, font=("Arial", 14), width=20)
-
-canvas.create_window(screen_width // 4, 500, window=button1)
-canvas.create_window(screen_width // 2, 500, window=button2)
-canvas.create_window(3 * screen_width // 4, 500, window=button_exit)
-
-# Create a small box from bottom-left to bottom-right
-bottom_box_height = 110  # Height of the bottom box
-canvas.create_rectangle(
-    # Top-left corner of the rectangle (start from the bottom left)
-    0, screen_height - bottom_box_height,
-    # Bottom-right corner of the rectangle (end at the bottom right)
-    screen_width, screen_height,
-    # Use the same sea green color or a different color if needed
-    fill="#008080", outline="#008080"
-)
-
-# Developed By Text
-canvas.create_text(750, 775, text="© Developed By: Ahmed Raza, Dinesh Kumar, Syed Muhammad Abbas Shah and Syed Zohaib Ahmed Qadri", font=(
-    "Arial", 12, "bold"), fill="black")
-
-root.mainloop()
+def main():
+    # Main Application Window
+    root = tk.Tk()
+    root.title("Queueing and Simulation System")
+
+    # Get the screen width and height
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+
+    # Maximize the window
+    root.state("zoomed")
+    root.geometry(f"{screen_width}x{screen_height}+0+0")
+
+    canvas = tk.Canvas(root, width=screen_width, height=screen_height)
+    canvas.pack(fill="both", expand=True)
+
+    # Create a light gray box spanning the top from left to right
+    top_box_height = 110  # Adjust the height as needed
+    canvas.create_rectangle(
+        0, 0,  # Top-left corner of the rectangle
+        screen_width, top_box_height,  # Bottom-right corner of the rectangle
+        fill="#008080", outline="#008080"  # Use a darker sea green color
+    )
+
+    # Add the logo to the top-left corner
+    logo_photo = load_image("logo.png", (270, 160))
+
+    canvas.create_image(-1, -25, image=logo_photo, anchor="nw")
+
+    # Title Label
+    text_id = canvas.create_text(
+        screen_width // 2, 55, text="Queuing and Simulation System", font=("Tahoma", 36, "bold"), fill="white")
+
+    # Buttons for options
+    button_exit = tk.Button(
+        root, text="Exit", command=root.destroy, font=("Arial", 12))
+
+    # Load and resize images to be square
+    image_size = 200  # Size for the square images
+    image1_photo = load_image("calculator.png", (image_size, image_size))
+    image2_photo = load_image("simulator.png", (image_size, image_size))
+    image3_photo = load_image("exit.png", (image_size, image_size))
+
+    # Place images side by side
+    canvas.create_image(screen_width // 4, 350, image=image1_photo)
+    canvas.create_image(screen_width // 2, 350, image=image2_photo)
+    canvas.create_image(3 * screen_width // 4, 350, image=image3_photo)
+
+    # Place buttons below each image
+    button1 = tk.Button(root, text="Queuing Calculator",
+                        command=lambda: open_queuing_calculator(root), font=("Arial", 14), width=20)
+    button2 = tk.Button(root, text="Simulator",
+                        command=lambda: open_simulator(root), font=("Arial", 14), width=20)
+
+    canvas.create_window(screen_width // 4, 500, window=button1)
+    canvas.create_window(screen_width // 2, 500, window=button2)
+    canvas.create_window(3 * screen_width // 4, 500, window=button_exit)
+
+    # Create a small box from bottom-left to bottom-right
+    bottom_box_height = 110  # Height of the bottom box
+    canvas.create_rectangle(
+        # Top-left corner of the rectangle (start from the bottom left)
+        0, screen_height - bottom_box_height,
+        # Bottom-right corner of the rectangle (end at the bottom right)
+        screen_width, screen_height,
+        # Use the same sea green color or a different color if needed
+        fill="#008080", outline="#008080"
+    )
+
+    # Developed By Text
+    canvas.create_text(750, 775, text="© Developed By: Ahmed Raza, Dinesh Kumar, Syed Muhammad Abbas Shah and Syed Zohaib Ahmed Qadri", font=(
+        "Arial", 12, "bold"), fill="black")
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sys
+import numpy as np
+from LCG import LCG
+from Random_Source import DEFAULT_LCG, make_source
+
+
+# Input check of the random sources
+# Run "python Source_Check.py"; LCG constants and seeds the generator cannot use have to be turned down with
+# a ValueError, which the simulator windows show as a message, and usable ones have to give the LCG's numbers.
+# Name, seed, a, c and m
+REJECTED = [
+    ("m of 0", 1, 5, 3, 0),
+    ("negative m", 1, 5, 3, -7),
+    ("negative a", 1, -5, 3, 16),
+    ("a of m", 1, 16, 3, 16),
+    ("negative c", 1, 5, -3, 16),
+    ("c beyond m", 1, 5, 20, 16),
+    ("negative seed", -1, 5, 3, 16),
+    ("m of 1", 0, 0, 0, 1),
+    ("a and c of 0", 7, 0, 0, 16),
+    ("a of 0", 7, 0, 3, 16),
+    ("a of 1, c of 0", 7, 1, 0, 16),
+    ("c of 0 from seed 0", 0, 5, 0, 16),
+]
+ACCEPTED = [
+    ("ANSI C defaults", 12345, None, None, None),
+    ("full period", 7, 5, 3, 16),
+    ("multiplicative", 1, 16807, 0, 2**31 - 1),
+    ("seed beyond m", 100, 5, 3, 16),
+]
+DRAWS = 1000
+
+
+def rejection(seed, a, c, m):
+    # The message of the ValueError, or the problem when there was none
+    try:
+        make_source("LCG", seed, a, c, m)
+    except ValueError as e:
+        return None, str(e)
+    except Exception as e:
+        return f"{type(e).__name__} instead of ValueError: {e}", None
+    return "accepted", None
+
+
+def acceptance(seed, a, c, m):
+    # The problem, if any, with a source that has to match LCG.randomNumber()
+    try:
+        source = make_source("LCG", seed, a, c, m)
+    except ValueError as e:
+        return f"rejected: {e}"
+    draws = source.random(DRAWS)
+    if len(np.unique(draws)) == 1:
+        return "gives the same number on every draw"
+    lcg = LCG(seed, *(DEFAULT_LCG if a is None else (a, c, m)))
+    expected = []
+    for _ in range(DRAWS):
+        lcg.next()
+        expected.append(lcg.randomNumber())
+    if not np.array_equal(draws, expected):
+        return "differs from LCG.randomNumber()"
+    return None
+
+
+def main():
+    failures = 0
+    print(f"{'Case':<22}  Result")
+    for name, *case in REJECTED:
+        problem, message = rejection(*case)
+        failures += bool(problem)
+        print(f"{name:<22}  {problem or 'rejected: ' + message}")
+    for name, *case in ACCEPTED:
+        problem = acceptance(*case)
+        failures += bool(problem)
+        print(f"{name:<22}  {problem or 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import math
+import numpy as np
+import Queue_Vector
+from Erlang import erlang_b_sequence, erlang_c, erlang_c_from_b
+from Queuing_Cal import mmc_queue, mgc_queue, ggc_queue, mmck_queue, mmcn_queue
+
+
+# Capacity planning: the smallest number of servers c that meets a waiting-time target
+# The target is either Wq <= max_wait, or P(Wq <= max_wait) >= service_level when a service level is given
+# The finite models (M/M/c/K, M/M/c//N) only take the Wq target and never need more servers than K or N
+MODELS = {"MMC": mmc_queue, "MGC": mgc_queue, "GGC": ggc_queue, "MMCK": mmck_queue, "MMCN": mmcn_queue}
+FINITE_MODELS = ["MMCK", "MMCN"]
+TARGETS = ["Max Wq", "Service Level"]
+MAX_SERVERS = 10**6
+
+
+def model_args(model, sigma_arrival, sigma_service, capacity, population):
+    # Extra arguments of the calculator model after lambda, mu and c
+    if model == "MMC":
+        return ()
+    if model == "MGC":
+        return (sigma_service,)
+    if model == "GGC":
+        return (sigma_arrival, sigma_service)
+    if model in FINITE_MODELS:
+        limit = capacity if model == "MMCK" else population
+        if limit is None:
+            raise ValueError(f"{model} needs its {'capacity' if model == 'MMCK' else 'population'}.")
+        return (limit,)
+    raise ValueError("The staffing solver needs a multi-server model (MMC, MGC, GGC, MMCK or MMCN).")
+
+
+def check_target(max_wait, service_level, model):
+    if model in FINITE_MODELS and service_level is not None:
+        raise ValueError("The finite models only support the Max Wq target.")
+    if service_level is None:
+        if max_wait <= 0:
+            raise ValueError("The target wait must be greater than 0.")
+    elif not 0 < service_level < 1 or max_wait < 0:
+        raise ValueError("The service level must be between 0% and 100% and the target wait at least 0.")
+
+
+def service_level_of(wait_probability, wq, max_wait):
+    # P(Wq <= t) = 1 - C exp(-C t / Wq) with C the probability of waiting
+    # Exact for M/M/c, where Wq / C = 1 / (c mu - lambda); the G models plug in their own Wq but keep the
+    # M/M/c Erlang C for C, so their service levels are an approximation
+    if wait_probability == 0:
+        return 1.0
+    return 1 - wait_probability * math.exp(-wait_probability * max_wait / wq)
+
+
+def staffing_result(model, lambda_rate, mu_rate, servers, max_wait, args):
+    result = MODELS[model](lambda_rate, mu_rate, servers, *args)
+    if "Error" in result:
+        raise ValueError(result["Error"])
+    if model in FINITE_MODELS:
+        return {"Servers": servers, **result}
+    wait_probability = erlang_c(lambda_rate / mu_rate, servers)
+    result["Service Level"] = service_level_of(wait_probability, result["Wq"], max_wait)
+    return {"Servers": servers, **result}
+
+
+def min_servers(lambda_rate, mu_rate, max_wait, service_level=None, model="MMC", sigma_arrival=0.0,
+                sigma_service=0.0, capacity=None, population=None):
+    # Smallest c that meets the target, with the calculator metrics at that c
+    args = model_args(model, sigma_arrival, sigma_service, capacity, population)
+    check_target(max_wait, service_level, model)
+    if lambda_rate <= 0 or mu_rate <= 0:
+        raise ValueError("Arrival and service rates must be greater than 0.")
+    a = lambda_rate / mu_rate
+    first = math.floor(a) + 1
+    max_servers = MAX_SERVERS
+    if model in FINITE_MODELS:
+        # Always stable, and with c = K (or N) nobody waits
+        first, max_servers = 1, args[0]
+
+    if model == "MMC":
+        # Walk up from the first stable c; every candidate costs one step of the Erlang B recurrence
+        for servers, b in enumerate(erlang_b_sequence(a, first), start=first):
+            wait_probability = erlang_c_from_b(b, a, servers)
+            wq = wait_probability / (servers * mu_rate - lambda_rate)
+            if service_level is None and wq <= max_wait:
+                break
+            if service_level is not None and service_level_of(wait_probability, wq, max_wait) >= service_level:
+                break
+            if servers >= MAX_SERVERS:
+                raise ValueError(f"The target cannot be met with {MAX_SERVERS} servers.")
+        return staffing_result(model, lambda_rate, mu_rate, servers, max_wait, args)
+
+    def meets(servers):
+        result = staffing_result(model, lambda_rate, mu_rate, servers, max_wait, args)
+        if service_level is None:
+            return result["Wq"] <= max_wait
+        return result["Service Level"] >= service_level
+
+    # Double the step until the target is met, then bisect between the last miss and the first hit
+    low, high, step = first - 1, first, max(1, math.isqrt(first))
+    while not meets(high):
+        if high >= max_servers:
+            raise ValueError(f"The target cannot be met with {max_servers} servers.")
+        low, high, step = high, min(high + step, max_servers), step * 2
+    while high - low > 1:
+        mid = (low + high) // 2
+        if meets(mid):
+            high = mid
+        else:
+            low = mid
+    return staffing_result(model, lambda_rate, mu_rate, high, max_wait, args)
+
+
+# --- Interval forecasts ---
+def forecast_result(model, lambda_rates, mu_rates, servers, max_wait, args, wait_probability=None):
+    # Queue_Vector metrics of every interval at the given staffing, plus its service level
+    # wait_probability is the Erlang C at those servers when the search already carries it
+    if model in FINITE_MODELS:
+        result = Queue_Vector.MODELS[model][0](lambda_rates, mu_rates, servers, *args)
+        return {"Servers": servers, **result}
+    if wait_probability is None:
+        wait_probability = Queue_Vector.erlang_c(lambda_rates / mu_rates, servers)
+    result = Queue_Vector.MODELS[model][0](lambda_rates, mu_rates, servers, *args, wait_probability=wait_probability)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        level = 1 - wait_probability * np.exp(-wait_probability * max_wait / result["Wq"])
+    result["Service Level"] = np.where(wait_probability > 0, level, 1.0)
+    return {"Servers": servers, **result}
+
+
+def min_servers_forecast(lambda_rates, mu_rate, max_wait, service_level=None, model="MMC", sigma_arrival=0.0,
+                         sigma_service=0.0, capacity=None, population=None):
+    # min_servers for a whole forecast at once: lambda_rates (and optionally the other parameters) are arrays
+    # of intervals that are searched in lockstep
+    # Intervals without arrivals need no servers
+    args = model_args(model, sigma_arrival, sigma_service, capacity, population)
+    lambda_rates, mu_rates, max_wait, *args = np.broadcast_arrays(
+        np.asarray(lambda_rates, dtype=float), np.asarray(mu_rate, dtype=float),
+        np.asarray(max_wait, dtype=float), *[np.asarray(arg, dtype=float) for arg in args])
+    if np.any(lambda_rates < 0) or np.any(mu_rates <= 0):
+        raise ValueError("Arrival rates must not be negative and service rates must be greater than 0.")
+    check_target(max_wait.min(initial=1), service_level, model)
+    shape = lambda_rates.shape
+    lambda_rates, mu_rates, max_wait, *args = [array.ravel() for array in (lambda_rates, mu_rates, max_wait, *args)]
+    busy = lambda_rates > 0
+    rates = np.where(busy, lambda_rates, 1.0)
+
+    def meets(result, max_wait):
+        if service_level is None:
+            return result["Wq"] <= max_wait
+        return result["Service Level"] >= service_level
+
+    wait_probability = None
+    if model in FINITE_MODELS:
+        # Always stable, and with c = K (or N) nobody waits: double the step until the target is met,
+        # then bisect between the last miss and the first hit
+        max_servers = np.floor(args[0])
+        if np.any(max_servers < 1):
+            raise ValueError("The capacity or population must be at least 1.")
+        low, high, step = np.zeros_like(rates), np.ones_like(rates), np.ones_like(rates)
+        hit = meets(forecast_result(model, rates, mu_rates, high, max_wait, args), max_wait)
+        while not hit.all():
+            if np.any(high[~hit] >= max_servers[~hit]):
+                raise ValueError(f"The target cannot be met with {int(max_servers[~hit].max())} servers.")
+            low = np.where(hit, low, high)
+            high = np.where(hit, high, np.minimum(high + step, max_servers))
+            step = np.where(hit, step, step * 2)
+            hit = meets(forecast_result(model, rates, mu_rates, high, max_wait, args), max_wait)
+        while (high - low > 1).any():
+            mid = np.floor((low + high) / 2)
+            hit = meets(forecast_result(model, rates, mu_rates, mid, max_wait, args), max_wait)
+            high = np.where(hit, mid, high)
+            low = np.where(hit, low, mid)
+    else:
+        # Walk every interval up from its first stable c, as min_servers does for M/M/c: the Erlang B
+        # recursion runs once per load up to that c, then each further candidate costs one step of it
+        # Only the intervals that still miss the target are carried along
+        a = rates / mu_rates
+        high = np.floor(a) + 1
+        wait_probability = np.empty_like(a)
+        idx = np.arange(len(a))
+        servers, erlang_b = high.copy(), Queue_Vector.erlang_b(a, high)
+        while len(idx):
+            wait = Queue_Vector.erlang_c_from_b(erlang_b, a[idx], servers)
+            result = forecast_result(model, rates[idx], mu_rates[idx], servers, max_wait[idx],
+                                     [arg[idx] for arg in args], wait)
+            hit = meets(result, max_wait[idx])
+            high[idx[hit]] = servers[hit]
+            wait_probability[idx[hit]] = wait[hit]
+            idx, servers, erlang_b = idx[~hit], servers[~hit] + 1, erlang_b[~hit]
+            if len(idx) and servers.max() > MAX_SERVERS:
+                raise ValueError(f"The target cannot be met with {MAX_SERVERS} servers.")
+            erlang_b = a[idx] * erlang_b / (servers + a[idx] * erlang_b)
+
+    servers = np.where(busy, high, 0).astype(np.int64)
+    result = forecast_result(model, rates, mu_rates, np.maximum(servers, 1), max_wait, args, wait_probability)
+    for key in result:
+        result[key] = np.where(busy, result[key], 1.0 if key == "Service Level" else 0).reshape(shape)
+    return result
@@ -0,0 +1,99 @@
+import math
+from statistics import NormalDist
+
+
+# --- Student t distribution ---
+def t_two_sided_prob(t, df):
+    # P(|T| < t) for integer degrees of freedom (Abramowitz & Stegun 26.7.3)
+    theta = math.atan(abs(t) / math.sqrt(df))
+    cos2 = math.cos(theta)**2
+    if df % 2 == 1:
+        term = math.sin(theta) * math.cos(theta)
+        total = theta + (term if df > 1 else 0)
+        for k in range(3, df - 1, 2):
+            term *= (k - 1) / k * cos2
+            total += term
+        return 2 / math.pi * total
+    term = 1.0
+    total = 1.0
+    for k in range(2, df - 1, 2):
+        term *= (k - 1) / k * cos2
+        total += term
+    return math.sin(theta) * total
+
+
+def t_quantile(confidence, df):
+    # Critical value t such that P(|T| < t) = confidence
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    if df > 200:
+        # Cornish-Fisher expansion around the normal quantile is exact to many digits here
+        return (z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+                + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3))
+
+    low, high = 0.0, max(1.0, z)
+    while t_two_sided_prob(high, df) < confidence:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if t_two_sided_prob(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+# --- Chi-square and normal distributions ---
+def gamma_q(s, x):
+    # Regularized upper incomplete gamma Q(s, x): a series below x = s + 1, a continued fraction above
+    if x <= 0:
+        return 1.0
+    log_front = s * math.log(x) - x - math.lgamma(s)
+    if x < s + 1:
+        term = total = 1 / s
+        k = s
+        while term > total * 1e-16:
+            k += 1
+            term *= x / k
+            total += term
+        return max(0.0, 1 - total * math.exp(log_front))
+    # Modified Lentz for the continued fraction of Q
+    tiny = 1e-300
+    b = x + 1 - s
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 100000):
+        an = -i * (i - s)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        h *= d * c
+        if abs(d * c - 1) < 1e-16:
+            break
+    return math.exp(log_front) * h
+
+
+def chi2_sf(x, df):
+    # P(X > x) for a chi-square variable with df degrees of freedom
+    return gamma_q(df / 2, x / 2)
+
+
+def normal_two_sided_p(z):
+    # P(|Z| > |z|) for a standard normal variable
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def kolmogorov_sf(d, n):
+    # P(D > d) for the Kolmogorov-Smirnov statistic of n observations, with Stephens' small-sample correction
+    # Each of the two series for the Kolmogorov distribution converges fast on its own side of 1
+    root = math.sqrt(n)
+    x = (root + 0.12 + 0.11 / root) * d
+    if x <= 0:
+        return 1.0
+    if x < 1:
+        total = sum(math.exp(-(2 * j - 1) ** 2 * math.pi ** 2 / (8 * x * x)) for j in range(1, 6))
+        return min(1.0, max(0.0, 1 - math.sqrt(2 * math.pi) / x * total))
+    return min(1.0, max(0.0, 2 * sum((-1) ** (j - 1) * math.exp(-2 * j * j * x * x) for j in range(1, 101))))
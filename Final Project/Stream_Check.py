@@ -0,0 +1,155 @@
+import contextlib
+import io
+import sys
+from unittest import mock
+import numpy as np
+import Engine
+
+
+# Check of the streamed path of the simulator windows
+# Run "python Stream_Check.py [customers]". A run is streamed in small chunks and the chunks are kept, so
+# Engine.stream_view can be compared with result_view of the same run put together: the table has to hold the
+# first customers, the sample has to be records of the run and the Total and Average rows have to agree.
+# The windows are then driven end to end with the streaming threshold lowered; tkinter is replaced by mocks
+# (VirtualTable gets a plain Frame) so the check runs without a display.
+CUSTOMERS = 30000
+CHUNK_SIZE = 1000
+HEAD = 500
+SAMPLE = 200
+SEED = 1
+# Model name, Engine.stream_* and the simulate_* window function with their arguments; every case loads
+# the servers to about 90%
+CASES = [
+    ("MMC", Engine.stream_mmc, "simulate_mmc", lambda customers: (2, 10 / 18, 10, customers)),
+    ("MGC", Engine.stream_mgc, "simulate_mgc", lambda customers: (2, 10, customers, "Uniform", (0, 36))),
+    ("GGC", Engine.stream_ggc, "simulate_ggc",
+     lambda customers: ("Gamma", (2, 0.25), 10, customers, "Normal", (4.5, 1))),
+]
+
+
+def combined(chunks):
+    # The whole run from its chunks; the first chunk has no inter-arrival time for its first customer
+    result = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in Engine.RECORD_KEYS}
+    result["inter_arrival_times"] = np.concatenate([chunk["inter_arrival_times"] for chunk in chunks])
+    result["server_busy_time"] = chunks[-1]["server_busy_time"]
+    return result
+
+
+def summary_errors(rows, expected):
+    # Largest relative difference of the Total and Average rows
+    error = 0.0
+    for row, expected_row in zip(rows, expected):
+        for value, expected_value in zip(row, expected_row):
+            if value != "-" and value != expected_value and expected_row[0] == row[0]:
+                error = max(error, abs(float(value) - float(expected_value)) / max(1.0, abs(float(expected_value))))
+    return error
+
+
+def check_view(view, result, head, sample):
+    # Differences between a streamed view and the whole run
+    problems = []
+    if not all(np.array_equal(view["table"][key], result[key][:head]) for key in Engine.RECORD_KEYS):
+        problems.append("table is not the first customers")
+    if not np.array_equal(view["inter_arrival_times"], result["inter_arrival_times"][:head - 1]):
+        problems.append("inter-arrival times are not the first customers'")
+    customers = view["customers"]
+    if len(customers) != sample or len(np.unique(customers)) != sample or np.any(np.diff(customers) <= 0):
+        problems.append("sample is not increasing distinct customers")
+    elif not all(np.array_equal(view["series"][key], result[key][customers - 1]) for key in Engine.RECORD_KEYS):
+        problems.append("sample records are not the run's")
+    if summary_errors(view["summary"], Engine.summary_rows(result)) > 0.01:
+        problems.append("summary rows differ")
+    if view["arrivals"] != len(result["arrival_times"]) or view["total_time"] != result["finish_times"].max():
+        problems.append("customer count or total time differ")
+    if not np.array_equal(view["server_busy_time"], result["server_busy_time"]):
+        problems.append("server busy times differ")
+    return problems
+
+
+def check_engine(stream, args, customers):
+    chunks = list(stream(*args(customers), chunk_size=CHUNK_SIZE, rng=np.random.default_rng(SEED)))
+    return check_view(Engine.stream_view(iter(chunks), HEAD, SAMPLE), combined(chunks), HEAD, SAMPLE)
+
+
+def mocked_tkinter():
+    # tkinter modules whose Button records its command, with a plain Frame for VirtualTable to subclass
+    class Frame:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def pack(self, *args, **kwargs):
+            pass
+
+    commands = []
+
+    def button(*args, **kwargs):
+        if "command" in kwargs:
+            commands.append((kwargs.get("text"), kwargs["command"]))
+        return mock.MagicMock()
+
+    tk = mock.MagicMock()
+    tk.Frame = Frame
+    tk.Button.side_effect = button
+    modules = {"tkinter": tk, "tkinter.ttk": tk.ttk, "tkinter.messagebox": tk.messagebox}
+    return modules, commands
+
+
+def check_window(name, stream, function, args, customers):
+    # Stream a run through the window and compare the table and the charts with the same run kept whole
+    import importlib
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    modules, commands = mocked_tkinter()
+    with mock.patch.dict(sys.modules, modules), \
+            mock.patch.multiple(Engine, STREAM_CUSTOMERS=customers - 1, HEAD_RECORDS=HEAD, SAMPLE_RECORDS=SAMPLE):
+        for module in ["Table_View", name]:
+            sys.modules.pop(module, None)
+        window = importlib.import_module(name)
+        window.Charts.figure_canvas = mock.MagicMock()
+        table = sys.modules["Table_View"].VirtualTable(None)
+        # The windows print the arrival times they chart
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(window, function)(*args(customers), table, None, np.random.default_rng(SEED))
+
+        result = combined(list(stream(*args(customers), rng=np.random.default_rng(SEED))))
+        problems = []
+        if table.row_count != HEAD + 2 or table.row_values(HEAD - 1) != Engine.table_row(result, HEAD - 1):
+            problems.append("table does not page over the first customers")
+        if summary_errors([table.row_values(HEAD), table.row_values(HEAD + 1)], Engine.summary_rows(result)) > 0.01:
+            problems.append("table summary rows differ")
+        status = table.status_label.config.call_args.kwargs["text"]
+        if f"first {HEAD} of {customers} customers" not in status:
+            problems.append(f"table status reads '{status}'")
+
+        # Every time-series chart plots sampled customers only
+        for text, command in commands:
+            figures = set(plt.get_fignums())
+            command()
+            if "Times" not in text or "Inter-Arrival" in text:
+                continue
+            for number in set(plt.get_fignums()) - figures:
+                x = np.asarray(plt.figure(number).axes[0].lines[0].get_xdata())
+                if len(x) > SAMPLE or x.max() <= HEAD:
+                    problems.append(f"'{text}' does not plot the sample")
+            plt.close("all")
+        for module in ["Table_View", name]:
+            sys.modules.pop(module, None)
+    return problems
+
+
+def main():
+    customers = int(sys.argv[1]) if len(sys.argv) > 1 else CUSTOMERS
+    failures = 0
+    print(f"{'Model':<6}{'Path':<8}  Result")
+    for name, stream, function, args in CASES:
+        for path, problems in [("engine", check_engine(stream, args, customers)),
+                               ("window", check_window(name, stream, function, args, customers))]:
+            failures += bool(problems)
+            print(f"{name:<6}{path:<8}  {'; '.join(problems) or 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import Engine
+
+
+# Map table columns to the result arrays they are sorted by
+SORT_KEYS = dict(zip(Engine.TABLE_COLUMNS[2:], Engine.TABLE_KEYS))
+SORT_KEYS["Server"] = "server"
+
+
+class VirtualTable(tk.Frame):
+    # Results table that only materializes the rows currently on screen
+    # The full result stays in the engine arrays; scrolling, jumping and sorting work on row positions
+    def __init__(self, master, columns=Engine.TABLE_COLUMNS, **kwargs):
+        super().__init__(master, **kwargs)
+        self.columns = columns
+        self.result = None
+        self.order = np.arange(0)
+        self.summary = []
+        self.arrivals = 0
+        self.first = 0
+        self.visible = 25
+        self.sort_column = None
+        self.sort_descending = False
+
+        # Jump-to-row bar
+        jump_frame = tk.Frame(self)
+        jump_frame.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(jump_frame, text="Go to Customer:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.jump_entry = tk.Entry(jump_frame, width=10)
+        self.jump_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        self.jump_entry.bind("<Return>", lambda event: self.jump_to_customer())
+        tk.Button(jump_frame, text="Go", command=self.jump_to_customer).pack(side=tk.LEFT, padx=5, pady=5)
+        self.status_label = tk.Label(jump_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        # Create the Treeview
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=self.visible)
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=100, anchor=tk.CENTER)
+
+        # The scrollbar drives the row window instead of the Treeview itself
+        self.vsb = tk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.vsb.pack(side=tk.RIGHT, fill="y")
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.first - self.visible))
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.first + self.visible))
+        self.tree.bind("<Home>", lambda event: self.scroll_to(0))
+        self.tree.bind("<End>", lambda event: self.scroll_to(self.row_count))
+
+    @property
+    def row_count(self):
+        return len(self.order) + len(self.summary)
+
+    def set_result(self, result, summary=None, arrivals=None):
+        # A streamed run (Engine.stream_view) passes its first customers as result, the summary rows of the
+        # whole run and its number of customers
+        self.result = result
+        self.order = np.arange(len(result["arrival_times"]))
+        self.summary = Engine.summary_rows(result) if summary is None else summary
+        self.arrivals = len(self.order) if arrivals is None else arrivals
+        self.set_sort(None, False)
+        self.first = 0
+        self.refresh()
+
+    def row_values(self, position):
+        # Customer rows first, then the summation and average rows
+        if position < len(self.order):
+            return Engine.table_row(self.result, self.order[position])
+        return self.summary[position - len(self.order)]
+
+    def refresh(self):
+        self.first = max(0, min(self.first, self.row_count - self.visible))
+        last = min(self.first + self.visible, self.row_count)
+
+        self.tree.delete(*self.tree.get_children())
+        for position in range(self.first, last):
+            self.tree.insert("", "end", values=self.row_values(position))
+
+        if self.row_count:
+            self.vsb.set(self.first / self.row_count, last / self.row_count)
+            shown = f" (first {len(self.order)} of {self.arrivals} customers)" if self.arrivals > len(self.order) else ""
+            self.status_label.config(text=f"Rows {self.first + 1}-{last} of {self.row_count}{shown}")
+        else:
+            self.vsb.set(0, 1)
+            self.status_label.config(text="")
+
+    def scroll_to(self, position):
+        self.first = int(position)
+        self.refresh()
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.row_count)
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self.scroll_to(self.first + int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        return self.scroll_to(self.first - int(event.delta / 120) * 3)
+
+    def on_resize(self, event):
+        # Only as many rows as fit in the widget are ever inserted
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+    def jump_to_customer(self):
+        try:
+            customer = int(self.jump_entry.get()) - 1
+        except ValueError:
+            return
+        if not 0 <= customer < len(self.order):
+            return
+        position = customer if self.sort_column is None else int(np.flatnonzero(self.order == customer)[0])
+        self.scroll_to(position)
+
+        # Highlight the requested customer
+        item = self.tree.get_children()[position - self.first]
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+
+    def sort_by(self, column):
+        if self.result is None:
+            return
+        descending = column == self.sort_column and not self.sort_descending
+        rows = np.arange(len(self.order))
+        keys = rows if column == "Customer" else self.result[SORT_KEYS[column]]
+        order = np.argsort(keys, kind="stable")
+        self.order = order[::-1] if descending else order
+        self.set_sort(column, descending)
+        self.scroll_to(0)
+
+    def set_sort(self, column, descending):
+        # Show the sort direction in the column heading
+        self.sort_column = column
+        self.sort_descending = descending
+        for col in self.columns:
+            arrow = (" ▼" if descending else " ▲") if col == column else ""
+            self.tree.heading(col, text=col + arrow)
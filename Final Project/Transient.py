@@ -0,0 +1,180 @@
+import math
+import numpy as np
+
+
+# Transient analysis of M/M/c and M/M/c/K: the distribution of the number in system at every time of a grid,
+# starting from a given state (an empty system by default, like the start of the day)
+# The chain is a birth-death process, so its generator is tridiagonal and is stored as three bands.
+# Uniformization turns it into the discrete chain P = I + Q / rate and
+#     p(t) = sum over k of Poisson(k; rate t) p(0) P^k
+# where one pass over k feeds every time of the grid. Both infinite sums are cut with an error bound:
+# - the Poisson sum at the step where the remaining weight of the latest time is below tolerance
+# - the M/M/c state space at a level N made absorbing: the mass that ends up in N is exactly the probability
+#   that the queue ever reached N, so N is doubled until that mass is below tolerance. It never has to go
+#   past the level that takes more arrivals than the horizon sees with probability above tolerance.
+# Uniformization also works for rho >= 1, which is exactly the case of an overloaded morning.
+# A stable queue settles long before a long horizon ends, and P only moves a distribution closer to the steady
+# state, so the steps stop once the distribution is within tolerance of it and the rest of every Poisson sum
+# is the steady state.
+BLOCK_STEPS = 256   # uniformization steps per matrix product into the time grid
+SMALL_LOG_FACTORIALS = np.array([math.lgamma(n + 1) for n in range(11)])   # log k! below Stirling's range
+
+
+def poisson_log_pmf(k, mean):
+    # log of Poisson(k; mean) for an array of k (rows) and an array of means (columns)
+    # Written around the mode as k (log1p(x) - x) with x = (mean - k) / k, plus Stirling's series for log k!,
+    # since k log(mean) - mean - log k! loses all the digits of its small result for means of 10^5 and more
+    k = k[:, np.newaxis].astype(float)
+    large = np.maximum(k, 10)
+    x = (mean - large) / large
+    stirling = 1 / (12 * large) - 1 / (360 * large**3) + 1 / (1260 * large**5)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_pmf = large * (np.log1p(x) - x) - 0.5 * np.log(2 * np.pi * large) - stirling
+        small = k * np.log(mean) - mean - SMALL_LOG_FACTORIALS[np.minimum(k, 10).astype(int)]
+    log_pmf = np.where(k >= 10, log_pmf, small)
+    # A mean of 0 puts all the weight on k = 0
+    return np.where(mean > 0, log_pmf, np.where(k == 0, 0.0, -np.inf))
+
+
+def poisson_right_point(mean, tolerance):
+    # Smallest n with P(Poisson(mean) > n) <= tolerance
+    if mean <= 0:
+        return 0
+    n = int(mean + 12 * math.sqrt(mean) + 60)
+    while True:
+        pmf = np.exp(poisson_log_pmf(np.arange(n + 1), np.array([mean])))[:, 0]
+        # tail[i] = P(Poisson > i), summed from the far end so small tails keep their precision
+        tail = np.concatenate((np.cumsum(pmf[::-1])[::-1][1:], [0.0]))
+        if tail[-1] + pmf[-1] <= tolerance:
+            return int(np.argmax(tail <= tolerance))
+        n *= 2
+
+
+def generator_bands(lambda_rate, mu_rate, servers, states, absorbing):
+    # Birth and death rates of states 0 .. states - 1; the last state has no births, and no deaths either
+    # when it is absorbing
+    n = np.arange(states)
+    births = np.where(n < states - 1, float(lambda_rate), 0.0)
+    deaths = np.minimum(n, servers) * float(mu_rate)
+    if absorbing:
+        deaths[-1] = 0.0
+    return births, deaths
+
+
+def steady_state(births, deaths):
+    # Stationary distribution of the birth-death chain from pi(n) births(n) = pi(n + 1) deaths(n + 1), in logs
+    # so thousands of states never overflow. An absorbing last state gets no mass; the rate at which pi flows
+    # into it is returned as the leak, the only thing that keeps pi from being exactly stationary.
+    states = len(births) - 1 if deaths[-1] == 0 else len(births)
+    with np.errstate(divide="ignore"):
+        log_pi = np.concatenate(([0.0], np.cumsum(np.log(births[:states - 1]) - np.log(deaths[1:states]))))
+    pi = np.zeros(len(births))
+    pi[:states] = np.exp(log_pi - log_pi.max())
+    pi /= pi.sum()
+    leak = pi[states - 1] * births[states - 1] if states < len(births) else 0.0
+    return pi, leak
+
+
+def uniformize(p, births, deaths, times, tolerance):
+    # Distributions at all times from p at time 0; every step of the uniformized chain is added to all
+    # times at once, a block of steps per matrix product
+    # Distances to the steady state never grow under P, except by twice the leak per unit of time, so once
+    # the distance plus that drift over the horizon is below tolerance / 2 the steady state stands in for
+    # every later step, beyond the Poisson cut as well
+    steady, leak = steady_state(births, deaths)
+    settled = tolerance / 2 - 2 * leak * times.max()
+    rate = (births + deaths).max()
+    stay = 1 - (births + deaths) / rate
+    up = births[:-1] / rate
+    down = deaths[1:] / rate
+    steps = poisson_right_point(rate * times.max(), tolerance)
+    means = rate * times
+    # Blocks where a time has no weight above this are skipped for it; that drops at most tolerance / 1000
+    log_threshold = math.log(tolerance / 1000 / (steps + 1))
+    probabilities = np.zeros((len(times), len(p)))
+    used = np.zeros(len(times))   # Poisson weight of every time that has been added so far
+    for first in range(0, steps + 1, BLOCK_STEPS):
+        if np.abs(p - steady).sum() <= settled:
+            probabilities += np.maximum(1 - used, 0)[:, np.newaxis] * steady
+            break
+        block = np.arange(first, min(first + BLOCK_STEPS, steps + 1))
+        vectors = np.empty((len(block), len(p)))
+        for i in range(len(block)):
+            vectors[i] = p
+            p = p * stay
+            p[1:] += vectors[i][:-1] * up
+            p[:-1] += vectors[i][1:] * down
+        # Only the times whose Poisson weights reach this block take part in the product. The Chernoff bound
+        # k log(mean / k) + k - mean on the log weight, at the step of the block closest to the mean, tells which
+        nearest = np.clip(means, block[0], block[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(nearest > 0, nearest * np.log(means / nearest), 0) + nearest - means
+        reached = bound >= log_threshold
+        if reached.any():
+            weights = np.exp(poisson_log_pmf(block, means[reached]))
+            probabilities[reached] += weights.T @ vectors
+            used[reached] += weights.sum(axis=0)
+    return probabilities
+
+
+def transient_queue(lambda_rate, mu_rate, servers, times, capacity=None, initial=0, tolerance=1e-10):
+    # Metrics of M/M/c (capacity None) or M/M/c/K at every time in times
+    # initial is the number in system at time 0, or a whole distribution over 0, 1, 2, ...
+    # The result holds the state probabilities (one row per time), the usual metrics as arrays and
+    # "Error Bound", the largest total probability the two truncations can be off by at any time
+    times = np.asarray(times, dtype=float)
+    if lambda_rate <= 0 or mu_rate <= 0 or servers < 1:
+        raise ValueError("Arrival and service rates must be greater than 0 and c at least 1.")
+    if capacity is not None and capacity < servers:
+        raise ValueError("The capacity K must be at least c.")
+    if times.ndim != 1 or len(times) == 0 or times.min() < 0:
+        raise ValueError("Times must be a non-empty list of values of at least 0.")
+    if np.ndim(initial) == 0:
+        if initial < 0 or initial != int(initial):
+            raise ValueError("The initial number in system must be a whole number of at least 0.")
+        start = np.zeros(int(initial) + 1)
+        start[-1] = 1.0
+    else:
+        start = np.trim_zeros(np.asarray(initial, dtype=float), "b")
+        if len(start) == 0 or start.min() < 0 or abs(start.sum() - 1) > 1e-9:
+            raise ValueError("The initial distribution must be probabilities that sum to 1.")
+
+    if capacity is None:
+        # Grow the truncated state space until the queue almost surely stays below its absorbing last state
+        # A stable queue starts from where its steady state reaches the last state less than about tolerance
+        # times over the horizon, so the steady state leaks too little into it for uniformize to switch to it
+        limit = len(start) + poisson_right_point(lambda_rate * times.max(), tolerance) + 1
+        rho = lambda_rate / (servers * mu_rate)
+        visits = 4 * lambda_rate * times.max() + 1
+        states = len(start) + servers + 64 + (math.ceil(math.log(tolerance / visits) / math.log(rho))
+                                              if rho < 1 else 0)
+        states = min(limit, states)
+        while True:
+            p = np.zeros(states)
+            p[:len(start)] = start
+            probabilities = uniformize(p, *generator_bands(lambda_rate, mu_rate, servers, states, True),
+                                       times, tolerance)
+            escaped = probabilities[:, -1].max()
+            if escaped <= tolerance or states == limit:
+                break
+            states = min(2 * states, limit)
+        probabilities = probabilities[:, :-1]
+    else:
+        if len(start) > capacity + 1:
+            raise ValueError("The initial state is beyond the capacity K.")
+        p = np.zeros(capacity + 1)
+        p[:len(start)] = start
+        probabilities = uniformize(p, *generator_bands(lambda_rate, mu_rate, servers, capacity + 1, False),
+                                   times, tolerance)
+        escaped = 0.0
+
+    n = np.arange(probabilities.shape[1])
+    busy = probabilities @ np.minimum(n, servers)
+    result = {"Times": times, "Probabilities": probabilities, "Utilization (rho)": busy / servers,
+              "Lq": probabilities @ np.maximum(n - servers, 0), "L": probabilities @ n,
+              "P(wait)": probabilities[:, servers:].sum(axis=1), "Error Bound": escaped + tolerance}
+    if capacity is not None:
+        # Arrivals that find K customers are turned away rather than waiting
+        result["Blocking Probability"] = probabilities[:, capacity]
+        result["P(wait)"] = probabilities[:, servers:capacity].sum(axis=1)
+    return result
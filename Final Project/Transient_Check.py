@@ -0,0 +1,95 @@
+import math
+import sys
+import time
+import numpy as np
+import Transient
+from Queuing_Cal import mmc_queue
+
+
+# Accuracy and time-budget check of the transient solver
+# Run "python Transient_Check.py [budget in s]". Small cases are compared with p(0) exp(Q t) from the eigenvalues
+# of the generator, which shares nothing with uniformization; the large case is a full day of a big call centre,
+# which has to settle onto the M/M/c steady state of the calculator within the budget.
+BUDGET_S = 3.0
+REPEAT = 3
+TOLERANCE = 1e-8
+# Name, lambda, mu, c, K (None for M/M/c), initial number in system, horizon
+# All but the last run long enough to switch to the steady state before the horizon
+CASES = [
+    ("M/M/1", 0.8, 1.0, 1, None, 0, 2000),
+    ("M/M/c busy start", 9.0, 1.0, 10, None, 15, 1500),
+    ("M/M/c/K overloaded", 12.0, 1.0, 10, 20, 0, 100),
+    ("M/M/c/K full start", 3.0, 2.0, 2, 8, 8, 5),
+]
+LARGE_CASE = ("M/M/c large", 900.0, 1.0, 1000, None, 0, 480)
+POINTS = 97
+
+
+def reference_probabilities(lambda_rate, mu_rate, servers, capacity, initial, times):
+    # D Q D^-1 is symmetric for D = diag(sqrt(pi)) with pi the stationary distribution, so exp(Q t) follows from
+    # eigh. M/M/c is cut where pi is 10^-12 of its largest value, which also keeps D well conditioned.
+    if capacity is None:
+        rho = lambda_rate / (servers * mu_rate)
+        capacity = initial + servers + math.ceil(math.log(1e-12) / math.log(rho))
+    births, deaths = Transient.generator_bands(lambda_rate, mu_rate, servers, capacity + 1, False)
+    pi, _ = Transient.steady_state(births, deaths)
+    scale = np.sqrt(pi)
+    off_diagonal = np.sqrt(births[:-1] * deaths[1:])
+    symmetric = np.diag(-(births + deaths)) + np.diag(off_diagonal, 1) + np.diag(off_diagonal, -1)
+    values, vectors = np.linalg.eigh(symmetric)
+    start = np.zeros(capacity + 1)
+    start[initial] = 1.0
+    left = (start / scale) @ vectors
+    return np.array([(left * np.exp(values * t)) @ vectors.T * scale for t in times])
+
+
+def check_case(lambda_rate, mu_rate, servers, capacity, initial, horizon):
+    # Largest difference of any state probability at any time
+    times = np.linspace(0, horizon, POINTS)
+    result = Transient.transient_queue(lambda_rate, mu_rate, servers, times, capacity, initial)
+    expected = reference_probabilities(lambda_rate, mu_rate, servers, capacity, initial, times)
+    states = min(expected.shape[1], result["Probabilities"].shape[1])
+    error = np.abs(result["Probabilities"][:, :states] - expected[:, :states]).max()
+    # Mass either side keeps beyond the states both have
+    error = max(error, 1 - result["Probabilities"][:, :states].sum(axis=1).min(),
+                1 - expected[:, :states].sum(axis=1).min())
+    return error
+
+
+def time_large_case(lambda_rate, mu_rate, servers, capacity, initial, horizon):
+    # Best of several runs, and the difference of the last L from the steady state L of the calculator
+    times = np.linspace(0, horizon, POINTS)
+    best = None
+    for _ in range(REPEAT):
+        begin = time.perf_counter()
+        result = Transient.transient_queue(lambda_rate, mu_rate, servers, times, capacity, initial)
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    steady = mmc_queue(lambda_rate, mu_rate, servers)["L"]
+    return best, abs(result["L"][-1] - steady) / steady
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_S
+    failures = 0
+    print(f"{'Case':<22}{'Max error':>12}  Result")
+    for name, *case in CASES:
+        error = check_case(*case)
+        failed = not error <= TOLERANCE
+        failures += failed
+        print(f"{name:<22}{error:>12.2e}  {'FAIL' if failed else 'OK'}")
+
+    name, *case = LARGE_CASE
+    elapsed, error = time_large_case(*case)
+    errors = []
+    if elapsed > budget:
+        errors.append(f"{elapsed:.2f} s is over the {budget} s budget")
+    if not error <= TOLERANCE:
+        errors.append(f"L at the horizon is {error:.2e} off the steady state")
+    failures += bool(errors)
+    print(f"{name:<22}{error:>12.2e}  {elapsed:.2f} s, {'; '.join(errors) or 'OK'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())